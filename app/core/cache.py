@@ -0,0 +1,140 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# In-process LRU caches with a per-entry TTL. Entries are dropped explicitly
+# when the underlying data changes; the TTL bounds staleness for changes this
+# process doesn't see (other workers, manual edits).
+#
+# Invalidations are also passed to listeners (add_invalidation_listener) as
+# (cache name, key), so a deployment with several workers can publish them,
+# e.g. over Redis pub/sub, and call apply_invalidation in the other workers.
+
+InvalidationListener = Callable[[str, Hashable], None]
+
+_caches: Dict[str, "LRUCache"] = {}
+_listeners: List[InvalidationListener] = []
+
+INVALIDATIONS_KEY = "cache_invalidations"
+
+
+class LRUCache:
+    """LRU cache with a TTL and hit / invalidation counters
+
+    Tuple keys can be invalidated by pattern: None in a position matches any
+    value there, e.g. (None, 7) drops every (user_id, 7) entry.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.expirations = 0
+        _caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None on a miss (None itself can't be cached)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable, propagate: bool = True):
+        """Drop an entry (or every entry matching a pattern key)"""
+        if isinstance(key, tuple) and None in key:
+            matching = [
+                cached_key for cached_key in self._entries
+                if len(cached_key) == len(key)
+                and all(part is None or part == cached_part for part, cached_part in zip(key, cached_key))
+            ]
+            for cached_key in matching:
+                del self._entries[cached_key]
+        else:
+            self._entries.pop(key, None)
+        self.invalidations += 1
+
+        if propagate:
+            for listener in _listeners:
+                listener(self.name, key)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def add_invalidation_listener(listener: InvalidationListener):
+    """Call `listener(cache_name, key)` on every local invalidation"""
+    _listeners.append(listener)
+
+
+def apply_invalidation(cache_name: str, key: Hashable):
+    """Apply an invalidation received from another worker (not propagated again)"""
+    cache = _caches.get(cache_name)
+    if cache is not None:
+        cache.invalidate(key, propagate=False)
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Stats of every cache, by name"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def invalidate_on_commit(session, cache: LRUCache, key: Hashable):
+    """Invalidate a cache entry once the session's current transaction commits
+
+    Invalidating only after the commit means a concurrent request can't put
+    the old row back into the cache in between. Dropped on rollback.
+    """
+    session.info.setdefault(INVALIDATIONS_KEY, []).append((cache, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session):
+    for cache, key in session.info.pop(INVALIDATIONS_KEY, []):
+        cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop(INVALIDATIONS_KEY, None)
@@ -5,12 +5,37 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./jira_lite.db"
+    DATABASE_READ_URL: Optional[str] = None  # Read replica for GET endpoints
+    READ_YOUR_WRITES_SECONDS: float = 5  # Users read from the primary this long after writing
+    SQL_ECHO: bool = False  # Log every statement (development only)
+    SLOW_QUERY_MS: float = 200  # Statements slower than this are logged
+
+    # Connection pool (per process; in-memory SQLite always uses one connection)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 behind pgbouncer
+
+    # SQLite production mode (SQLite files only)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # Negative: KiB per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_SINGLE_WRITER: bool = True  # Queue writers in-process instead of polling for the lock
 
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
 
+    # Password hashing (bcrypt, in a dedicated thread pool)
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Running + queued; beyond that, 503
+
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
@@ -26,6 +51,22 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
 
+    # Access-control cache (per process)
+    ACL_CACHE_SIZE: int = 10000
+    ACL_CACHE_TTL: int = 60  # seconds
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 30  # seconds
+
+    # Purge job: soft-deleted issues and comments are archived after this long
+    PURGE_ENABLED: bool = True
+    PURGE_AFTER_DAYS: int = 30
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_INTERVAL_SECONDS: int = 3600
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Serve /metrics (Prometheus text format)
+    METRICS_TOKEN: Optional[str] = None  # Bearer token for /metrics; unset: loopback clients only
+
     # App
     APP_NAME: str = "Jira Lite MVP"
     FRONTEND_URL: str = "http://localhost:3000"
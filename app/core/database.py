@@ -1,20 +1,61 @@
+from typing import Optional
+from sqlalchemy import inspect, text, event, Index
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, Session
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core import query_stats  # noqa: F401  (registers the query accounting events)
+from app.core.pool import InstrumentedPool
+from app.core.sqlite import configure_sqlite
+
+
+def async_database_url(url: str) -> str:
+    """Convert Railway's postgres:// URL to SQLAlchemy's async format"""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+database_url = async_database_url(settings.DATABASE_URL)
+
+
+def is_sqlite_file(url: str) -> bool:
+    parsed_url = make_url(url)
+    return parsed_url.get_backend_name() == "sqlite" and parsed_url.database not in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """Pool and driver options for an engine on `url`"""
+    parsed_url = make_url(url)
+    if parsed_url.get_backend_name() == "sqlite" and not is_sqlite_file(url):
+        # An in-memory database only exists on its one connection
+        return {}
+
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if parsed_url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
 
-# Convert Railway's postgres:// URL to SQLAlchemy's async format
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-elif database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 # Create async engine
 engine = create_async_engine(
     database_url,
-    echo=True,
-    future=True
+    echo=settings.SQL_ECHO,
+    future=True,
+    **engine_options(database_url)
 )
+if is_sqlite_file(database_url):
+    configure_sqlite(engine.sync_engine)
 
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(
@@ -23,9 +64,117 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Optional read replica. Its schema is managed on the primary (and replicated).
+read_engine = None
+ReadSessionLocal = None
+if settings.DATABASE_READ_URL:
+    read_database_url = async_database_url(settings.DATABASE_READ_URL)
+    read_engine = create_async_engine(
+        read_database_url,
+        echo=settings.SQL_ECHO,
+        future=True,
+        **engine_options(read_database_url)
+    )
+    if is_sqlite_file(read_database_url):
+        configure_sqlite(read_engine.sync_engine)
+    ReadSessionLocal = async_sessionmaker(
+        read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
 # Base class for models
 Base = declarative_base()
 
+# Indexes replaced by others; dropped on startup (see create_missing_indexes)
+RETIRED_INDEXES = (
+    "ix_issues_project_created",
+    "ix_issues_project_status_rank",
+)
+
+
+def live_rows_index(name: str, *columns: str) -> Index:
+    """Partial index over rows that aren't soft-deleted
+
+    Used by queries filtering on `deleted_at IS NULL`; soft-deleted rows stay
+    out of the index.
+    """
+    live = text("deleted_at IS NULL")
+    return Index(name, *columns, sqlite_where=live, postgresql_where=live)
+
+
+def add_missing_columns(connection):
+    """Add nullable columns added to models after their table already existed
+
+    create_all() never alters existing tables. Only nullable columns without a
+    server default are handled, which is what new optional fields look like.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns or not column.nullable or column.server_default is not None:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
+def create_missing_indexes(connection):
+    """Create indexes added to models after their table already existed
+
+    create_all() skips existing tables entirely, including their indexes.
+    Retired indexes are dropped.
+    """
+    for name in RETIRED_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+# Read-your-writes: users who committed a write in the last
+# READ_YOUR_WRITES_SECONDS read from the primary, so replica lag never hides
+# their own changes from them. Tracked per process.
+USER_ID_KEY = "user_id"
+WROTE_KEY = "wrote"
+
+recent_writers = LRUCache("recent_writers", 100000, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def read_session_factory(user_id: int) -> Optional[async_sessionmaker]:
+    """Session factory for `user_id`'s reads: the replica, or None for the primary"""
+    if ReadSessionLocal is None or recent_writers.get(user_id) is not None:
+        return None
+    return ReadSessionLocal
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context):
+    session.info[WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session):
+    user_id = session.info.get(USER_ID_KEY)
+    if session.info.pop(WROTE_KEY, False) and user_id is not None and ReadSessionLocal is not None:
+        recent_writers.set(user_id, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session: Session):
+    session.info.pop(WROTE_KEY, None)
+
 
 # Dependency to get DB session
 async def get_db():
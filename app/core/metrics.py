@@ -0,0 +1,260 @@
+import functools
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.query_stats import current_query_stats
+
+# Prometheus metrics, rendered in the text exposition format by /metrics.
+#
+# Everything is updated from the event loop thread only, so counters are
+# plain ints and floats without locks. Label children are created once per
+# label set and cached, and the request middleware looks its children up in
+# nested dicts keyed by strings that already exist (route template, method),
+# so recording a request allocates no label tuples.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route (keeps label values bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Per bucket (not cumulative), last is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """A named metric with its children, one per label set"""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: Tuple[str, ...], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.kind = kind  # "counter" or "histogram"
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        _registry.append(self)
+
+    def labels(self, *values: str):
+        """Child for a label set; callers on hot paths should keep the result"""
+        child = self._children.get(values)
+        if child is None:
+            child = Counter() if self.kind == "counter" else Histogram(self.buckets)
+            self._children[values] = child
+        return child
+
+    def render(self) -> List[str]:
+        name = f"{self.name}_total" if self.kind == "counter" else self.name
+        lines = [f"# HELP {name} {self.help}", f"# TYPE {name} {self.kind}"]
+        for values, child in self._children.items():
+            labels = [f'{label}="{_escape(value)}"' for label, value in zip(self.labelnames, values)]
+            if self.kind == "counter":
+                lines.append(_sample(name, labels, child.value))
+                continue
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(_sample(f"{name}_bucket", labels + [f'le="{le}"'], cumulative))
+            lines.append(_sample(f"{name}_sum", labels, child.sum))
+            lines.append(_sample(f"{name}_count", labels, child.count))
+        return lines
+
+
+def _sample(name: str, labels: List[str], value) -> str:
+    return f"{name}{{{','.join(labels)}}} {value}" if labels else f"{name} {value}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry: List[MetricFamily] = []
+
+REQUEST_DURATION = MetricFamily(
+    "http_request_duration_seconds", "Time to handle a request, by route template",
+    "histogram", ("method", "route")
+)
+REQUESTS = MetricFamily(
+    "http_requests", "Requests handled, by route template and status code",
+    "counter", ("method", "route", "status")
+)
+REQUEST_DB_DURATION = MetricFamily(
+    "http_request_db_duration_seconds", "Database time per request, by route template",
+    "histogram", ("method", "route")
+)
+REQUEST_DB_STATEMENTS = MetricFamily(
+    "http_request_db_statements", "Database statements run, by route template",
+    "counter", ("method", "route")
+)
+REQUEST_EXTERNAL_DURATION = MetricFamily(
+    "http_request_external_duration_seconds", "Time in external services (AI, email) per request, by route template",
+    "histogram", ("method", "route", "service")
+)
+EXTERNAL_CALL_DURATION = MetricFamily(
+    "external_call_duration_seconds", "Duration of calls to external services",
+    "histogram", ("service", "operation"), buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+EXTERNAL_CALL_ERRORS = MetricFamily(
+    "external_call_errors", "Failed calls to external services",
+    "counter", ("service", "operation")
+)
+
+
+def timed_external(service: str, operation: str):
+    """Decorator for async calls to an external service (histogram + per-request time)"""
+    duration = EXTERNAL_CALL_DURATION.labels(service, operation)
+    errors = EXTERNAL_CALL_ERRORS.labels(service, operation)
+
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                duration.observe(elapsed)
+                stats = current_query_stats()
+                if stats is not None:
+                    stats.add_external(service, elapsed)
+        return wrapper
+    return decorator
+
+
+class _RouteChildren:
+    __slots__ = ("duration", "db_duration", "db_statements", "statuses", "external", "method", "route")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = REQUEST_DURATION.labels(method, route)
+        self.db_duration = REQUEST_DB_DURATION.labels(method, route)
+        self.db_statements = REQUEST_DB_STATEMENTS.labels(method, route)
+        self.statuses: Dict[int, Counter] = {}
+        self.external: Dict[str, Histogram] = {}
+
+    def status(self, status_code: int) -> Counter:
+        counter = self.statuses.get(status_code)
+        if counter is None:
+            counter = self.statuses[status_code] = REQUESTS.labels(self.method, self.route, str(status_code))
+        return counter
+
+    def external_duration(self, service: str) -> Histogram:
+        histogram = self.external.get(service)
+        if histogram is None:
+            histogram = self.external[service] = REQUEST_EXTERNAL_DURATION.labels(self.method, self.route, service)
+        return histogram
+
+
+_routes: Dict[str, Dict[str, _RouteChildren]] = {}
+_templates: Dict[int, str] = {}  # By id() of the route (routes live as long as the app)
+
+
+def _route_template(scope) -> str:
+    """Full path template of the matched route, e.g. /api/issues/{issue_id}"""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    template = _templates.get(id(route))
+    if template is not None:
+        return template
+
+    path_format = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path_format is None:
+        return UNMATCHED_ROUTE
+    # A route of an included router may only know its path below the
+    # router's prefix: recover the prefix from the request path once
+    try:
+        concrete = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        concrete = path_format
+    path = scope["path"]
+    prefix = path[: len(path) - len(concrete)] if path.endswith(concrete) else ""
+    template = _templates[id(route)] = prefix + path_format
+    return template
+
+
+def _route_children(route: str, method: str) -> _RouteChildren:
+    by_method = _routes.get(route)
+    if by_method is None:
+        by_method = _routes[route] = {}
+    children = by_method.get(method)
+    if children is None:
+        children = by_method[method] = _RouteChildren(method, route)
+    return children
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request metrics per route template
+
+    Runs inside QueryStatsMiddleware, whose per-request stats supply the
+    database and external service times.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            children = _route_children(_route_template(scope), scope["method"])
+            children.duration.observe(time.perf_counter() - started)
+            children.status(status_code).inc()
+
+            stats = current_query_stats()
+            if stats is not None:
+                children.db_duration.observe(stats.duration)
+                children.db_statements.inc(stats.count)
+                if stats.external:
+                    for service, elapsed in stats.external.items():
+                        children.external_duration(service).observe(elapsed)
+
+
+def render_metrics(extra: Optional[List[str]] = None) -> str:
+    """Every metric in the Prometheus text format (plus pre-rendered `extra` lines)"""
+    lines: List[str] = []
+    for family in _registry:
+        lines.extend(family.render())
+    if extra:
+        lines.extend(extra)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Connection pool with checkout accounting, to tell "the database is slow"
+# apart from "requests are queueing for a connection".
+
+RECENT_WAITS = 1000
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits = deque(maxlen=RECENT_WAITS)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            # Includes opening a new connection when the pool had to grow
+            wait = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent_waits.append(wait)
+
+    def stats(self) -> dict:
+        recent = sorted(self._recent_waits)
+
+        def percentile(fraction: float):
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(len(recent) * fraction))] * 1000, 3)
+
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            # Negative while the pool hasn't opened pool_size connections yet
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms": {
+                "mean": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(self.max_wait * 1000, 3),
+            },
+        }
+
+
+def pool_metric_lines(pools: dict) -> list:
+    """Prometheus gauges and counters for instrumented pools, by pool name"""
+    gauges = (
+        ("db_pool_size", "Connections the pool keeps open", "gauge", lambda stats: stats["size"]),
+        ("db_pool_checked_out", "Connections in use", "gauge", lambda stats: stats["checked_out"]),
+        ("db_pool_overflow", "Connections beyond the pool size", "gauge", lambda stats: stats["overflow"]),
+        ("db_pool_checkouts_total", "Connection checkouts", "counter", lambda stats: stats["checkouts"]),
+        ("db_pool_timeouts_total", "Checkouts that timed out", "counter", lambda stats: stats["timeouts"]),
+    )
+    instrumented = {name: pool.stats() for name, pool in pools.items() if isinstance(pool, InstrumentedPool)}
+    lines = []
+    for metric, help, kind, value in gauges:
+        lines.append(f"# HELP {metric} {help}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, stats in instrumented.items():
+            lines.append(f'{metric}{{pool="{name}"}} {value(stats)}')
+    return lines
+
+
+def pool_stats(pool) -> dict:
+    """Stats of an engine's pool (only checkout counts for instrumented pools)"""
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
@@ -0,0 +1,123 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Per-request database accounting: cursor events on every engine add each
+# statement's duration to the current request's QueryStats (a context
+# variable set by QueryStatsMiddleware). The totals are returned in a
+# Server-Timing header, and statements slower than SLOW_QUERY_MS are logged
+# without their parameter values.
+
+logger = logging.getLogger(__name__)
+
+START_TIMES_KEY = "query_start_times"
+
+
+class QueryStats:
+    """Statements run and time spent in the database while handling one request
+
+    Also collects time spent in external services (see metrics.timed_external).
+    """
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.external: Optional[Dict[str, float]] = None  # seconds by service, once used
+
+    def add_external(self, service: str, elapsed: float):
+        if self.external is None:
+            self.external = {}
+        self.external[service] = self.external.get(service, 0.0) + elapsed
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, if any"""
+    return _current_stats.get()
+
+
+def _redact(parameters, executemany: bool) -> str:
+    # Keep the shape (types) of the parameters, never their values
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "<redacted>"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault(START_TIMES_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - connection.info[START_TIMES_KEY].pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "slow query duration_ms=%.1f request=%s statement=%s parameters=%s",
+            elapsed * 1000,
+            f"{stats.method} {stats.path}" if stats is not None else "-",
+            " ".join(statement.split()),
+            _redact(parameters, executemany),
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # The statement failed, so after_cursor_execute won't pop its start time
+    connection = exception_context.connection
+    start_times = connection.info.get(START_TIMES_KEY) if connection is not None else None
+    if start_times:
+        start_times.pop()
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware adding a Server-Timing header with the request's database totals
+
+        Server-Timing: db;dur=4.20;desc="3 queries", app;dur=9.87
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope.get("method", ""), scope.get("path", ""))
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                if stats.external:
+                    timing += "".join(f"{service};dur={elapsed * 1000:.2f}, " for service, elapsed in stats.external.items())
+                timing += f"app;dur={(time.perf_counter() - started) * 1000:.2f}"
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
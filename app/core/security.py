@@ -1,21 +1,38 @@
+import asyncio
+import ipaddress
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, inspect
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import LRUCache, invalidate_on_commit
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, read_session_factory, USER_ID_KEY
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt takes tens of milliseconds of CPU per call, so request handlers run it
+# in this pool instead of on the event loop. The number of pending calls is
+# capped: when the pool is saturated, requests fail fast with a 503 instead of
+# queueing behind each other.
+_hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_pending_hashes = 0
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified principals by user id: column values of users that exist and aren't
+# deleted. The token itself (signature, exp) is still checked on every request.
+principal_cache = LRUCache("principals", settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -27,6 +44,36 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_in_hash_pool(function: Callable, *args):
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, function, *args)
+    finally:
+        _pending_hashes -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the password hashing pool"""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the password hashing pool
+
+    Returns (valid, new_hash): new_hash is set when the stored hash uses
+    outdated settings (e.g. BCRYPT_ROUNDS changed) and should be saved.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -61,10 +108,79 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == int(user_id), User.deleted_at.is_(None)))
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        raise credentials_exception
+
+    # Attributes the session's writes to the user (read-your-writes routing)
+    db.info[USER_ID_KEY] = user_id
+
+    values = principal_cache.get(user_id)
+    if values is not None:
+        # Attach a copy to the session without a query; it behaves like a
+        # loaded row, so routes can still modify and commit it
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    principal_cache.set(user_id, {
+        column.key: getattr(user, column.key) for column in inspect(User).column_attrs
+    })
     return user
+
+
+async def get_read_db(
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """DB session for read-only endpoints
+
+    A read replica session when DATABASE_READ_URL is set, unless the user
+    wrote recently; otherwise the request's primary session.
+    """
+    session_factory = read_session_factory(current_user.id)
+    if session_factory is None:
+        yield db
+        return
+
+    async with session_factory() as session:
+        yield session
+
+
+def invalidate_principal(db: AsyncSession, user_id: int):
+    """Forget a cached user (profile, password or account changes) once the transaction commits"""
+    invalidate_on_commit(db, principal_cache, user_id)
+
+
+def verify_metrics_access(request: Request):
+    """Guard for /metrics: the METRICS_TOKEN bearer token, or a loopback client if no token is set
+
+    The metrics show route templates, error rates and pool state, so they
+    aren't public. Prometheus sends the token with `authorization.credentials`.
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        if request.client is not None and ipaddress.ip_address(request.client.host).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Metrics are only served to local clients unless METRICS_TOKEN is set"
+    )
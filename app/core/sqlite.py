@@ -0,0 +1,83 @@
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from app.core.config import settings
+
+# SQLite production mode, for file databases:
+#
+# - Pragmas on every new connection: WAL lets readers run alongside the
+#   writer, synchronous=NORMAL makes a commit an append to the WAL (fsynced
+#   at checkpoints, so commits are grouped per checkpoint instead of one
+#   fsync each), and busy_timeout waits for locks instead of failing with
+#   "database is locked".
+# - A single writer: SQLite allows one write transaction at a time, and a
+#   connection waiting in busy_timeout polls with sleeps. Pooled connections
+#   take an in-process lock before their first write statement and hold it
+#   until the transaction ends, so writers queue in order without polling,
+#   while reads keep using every pooled connection.
+#
+# The driver only opens a transaction at the first write statement, so a
+# connection never holds a read snapshot while it waits for the lock.
+
+WRITE_LOCK_KEY = "sqlite_write_lock"
+
+_WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def _pragmas() -> list:
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+    ]
+
+
+def _is_write(statement: str) -> bool:
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in _WRITE_KEYWORDS
+
+
+def configure_sqlite(sync_engine: Engine):
+    """Apply the SQLite production mode to an engine on a SQLite file"""
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    if not settings.SQLITE_SINGLE_WRITER:
+        return
+
+    write_lock = asyncio.Lock()
+
+    def release(info: dict):
+        if info.pop(WRITE_LOCK_KEY, False):
+            write_lock.release()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _acquire_write_lock(connection, cursor, statement, parameters, context, executemany):
+        if WRITE_LOCK_KEY in connection.info or not _is_write(statement) or not in_greenlet():
+            return
+        await_only(write_lock.acquire())
+        connection.info[WRITE_LOCK_KEY] = True
+
+    @event.listens_for(sync_engine, "commit")
+    def _release_on_commit(connection):
+        release(connection.info)
+
+    @event.listens_for(sync_engine, "rollback")
+    def _release_on_rollback(connection):
+        release(connection.info)
+
+    @event.listens_for(sync_engine, "checkin")
+    def _release_on_checkin(dbapi_connection, connection_record):
+        # Safety net for connections returned without commit / rollback events
+        release(connection_record.info)
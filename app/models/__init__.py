@@ -6,6 +6,8 @@ from app.models.comment import Comment
 from app.models.notification import Notification
 from app.models.activity_log import ActivityLog
 from app.models.invite import TeamInvite
+from app.models.quota import QuotaCounter
+from app.models.archive import ArchivedRow
 
 __all__ = [
     "User",
@@ -23,4 +25,6 @@ __all__ = [
     "Notification",
     "ActivityLog",
     "TeamInvite",
+    "QuotaCounter",
+    "ArchivedRow",
 ]
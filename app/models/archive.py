@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class ArchivedRow(Base):
+    """A row moved out of its table by the purge job (see app/utils/purge.py)
+
+    One table for every archived table: the row is kept as JSON, so archived
+    data survives later schema changes of its table.
+    """
+    __tablename__ = "archived_rows"
+    __table_args__ = (
+        Index("ix_archived_rows_table_row", "table_name", "row_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    data = Column(JSON, nullable=False)
+
+    # Timestamps
+    deleted_at = Column(DateTime, nullable=True)  # When the row (or its parent) was soft-deleted
+    archived_at = Column(DateTime, default=datetime.utcnow)
@@ -2,11 +2,14 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, live_rows_index
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        live_rows_index("ix_comments_live_issue_created", "issue_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
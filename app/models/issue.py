@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Boolean, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, live_rows_index
 
 
 class IssueStatus(str, enum.Enum):
@@ -21,6 +21,14 @@ class IssuePriority(str, enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Keyset pagination of issue lists (newest first)
+        live_rows_index("ix_issues_live_project_created", "project_id", "created_at", "id"),
+        # Board columns ordered by rank
+        live_rows_index("ix_issues_live_project_status_rank", "project_id", "status", "rank"),
+        # "Assigned to me"
+        live_rows_index("ix_issues_live_assignee", "assignee_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -33,7 +41,8 @@ class Issue(Base):
     status = Column(String(30), default=IssueStatus.BACKLOG.value, nullable=False)
     priority = Column(Enum(IssuePriority), default=IssuePriority.MEDIUM)
     due_date = Column(Date, nullable=True)
-    position = Column(Integer, default=0)  # For ordering within status column
+    position = Column(Integer, default=0)  # Legacy ordering within status column
+    rank = Column(String(64), nullable=True)  # Fractional rank, see app/utils/ranking.py
 
     # AI cache
     ai_summary = Column(Text, nullable=True)
@@ -66,6 +75,7 @@ class IssueLabel(Base):
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Part of issue ETags
 
     # Relationships
     project = relationship("Project", back_populates="labels")
@@ -75,6 +85,9 @@ class IssueLabel(Base):
 class IssueLabelAssignment(Base):
     """Many-to-many relationship between issues and labels"""
     __tablename__ = "issue_label_assignments"
+    __table_args__ = (
+        Index("ix_issue_label_assignments_issue_label", "issue_id", "label_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
@@ -91,6 +104,9 @@ class IssueLabelAssignment(Base):
 class Subtask(Base):
     """Checklist-style subtasks for an issue"""
     __tablename__ = "subtasks"
+    __table_args__ = (
+        Index("ix_subtasks_issue_position", "issue_id", "position"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
@@ -109,6 +125,9 @@ class Subtask(Base):
 class IssueHistory(Base):
     """Track changes to issues"""
     __tablename__ = "issue_history"
+    __table_args__ = (
+        Index("ix_issue_history_issue_changed", "issue_id", "changed_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
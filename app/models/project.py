@@ -1,12 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, live_rows_index
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        live_rows_index("ix_projects_live_team", "team_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -50,6 +53,9 @@ class ProjectStatus(Base):
 class ProjectFavorite(Base):
     """User's favorite projects"""
     __tablename__ = "project_favorites"
+    __table_args__ = (
+        Index("ix_project_favorites_user_project", "user_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
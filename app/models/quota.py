@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+from app.core.database import Base
+
+
+class QuotaCounter(Base):
+    """Live number of children of a parent, for the per-parent limits
+
+    Kept in step with inserts and soft deletes inside the same transaction, so
+    limit checks and counts are single-row reads instead of COUNT(*) scans.
+    """
+    __tablename__ = "quota_counters"
+    __table_args__ = (
+        UniqueConstraint("scope", "owner_id", name="uq_quota_counters_scope_owner"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(30), nullable=False)  # team_projects, project_issues, issue_subtasks
+    owner_id = Column(Integer, nullable=False)  # Team, project or issue id, depending on scope
+    value = Column(Integer, nullable=False, default=0)
@@ -6,10 +6,11 @@ from datetime import timedelta
 
 from app.core.database import get_db
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password,
     create_access_token,
-    get_current_user
+    get_current_user,
+    invalidate_principal
 )
 from app.core.config import settings
 from app.models.user import User
@@ -28,6 +29,16 @@ from app.utils.email import send_password_reset_email, generate_token
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def _check_login_password(db: AsyncSession, user: User, password: str) -> bool:
+    """Verify a login password, upgrading the stored hash if its settings are outdated"""
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if valid and new_hash:
+        user.hashed_password = new_hash
+        invalidate_principal(db, user.id)
+        await db.commit()
+    return valid
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def signup(user_create: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user with email/password"""
@@ -46,7 +57,7 @@ async def signup(user_create: UserCreate, db: AsyncSession = Depends(get_db)):
     user = User(
         email=user_create.email,
         name=user_create.name,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=await hash_password_async(user_create.password),
         is_oauth=False
     )
 
@@ -73,7 +84,7 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
             detail="Email or password is incorrect"
         )
 
-    if not verify_password(login_data.password, user.hashed_password):
+    if not await _check_login_password(db, user, login_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email or password is incorrect"
@@ -108,7 +119,7 @@ async def login_form(
             detail="Incorrect email or password"
         )
 
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await _check_login_password(db, user, form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -142,6 +153,7 @@ async def update_profile(
     if user_update.profile_image is not None:
         current_user.profile_image = user_update.profile_image
 
+    invalidate_principal(db, current_user.id)
     await db.commit()
     await db.refresh(current_user)
 
@@ -164,7 +176,8 @@ async def change_password(
         )
 
     # Verify current password
-    if not verify_password(password_change.current_password, current_user.hashed_password):
+    valid, _ = await verify_and_update_password(password_change.current_password, current_user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -178,7 +191,8 @@ async def change_password(
         )
 
     # Update password
-    current_user.hashed_password = get_password_hash(password_change.new_password)
+    current_user.hashed_password = await hash_password_async(password_change.new_password)
+    invalidate_principal(db, current_user.id)
     await db.commit()
 
     return {"message": "Password changed successfully"}
@@ -223,6 +237,7 @@ async def delete_account(
     # If user owns teams, prevent deletion
 
     user.deleted_at = datetime.utcnow()
+    invalidate_principal(db, user.id)
     await db.commit()
 
     return {"message": "Account deleted successfully"}
@@ -281,6 +296,7 @@ async def google_login(
         # Update profile image if available
         if picture and not user.profile_image:
             user.profile_image = picture
+            invalidate_principal(db, user.id)
             await db.commit()
     else:
         # Create new user
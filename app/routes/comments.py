@@ -5,12 +5,15 @@ from typing import List
 from datetime import datetime
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_read_db
 from app.models.user import User
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from app.utils.permissions import verify_issue_access
 from app.utils.helpers import create_notification
+from app.utils.loaders import get_loader
+from app.utils.search import reindex_issue
+from app.utils.serialization import fast_response
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
@@ -32,8 +35,8 @@ async def create_comment(
     )
 
     db.add(comment)
-    await db.commit()
-    await db.refresh(comment)
+    await db.flush()
+    await reindex_issue(db, comment.issue_id)
 
     # Notify issue owner and assignee
     if issue.creator_id != current_user.id:
@@ -54,38 +57,36 @@ async def create_comment(
             issue_id=issue.id
         )
 
-    response = CommentResponse.from_orm(comment)
-    response.author_name = current_user.name
+    await db.commit()
+    await db.refresh(comment)
 
-    return response
+    return _build_comment_response(comment, current_user.name)
 
 
 @router.get("/issue/{issue_id}", response_model=List[CommentResponse])
 async def list_comments(
     issue_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all comments on an issue"""
 
     await verify_issue_access(db, current_user.id, issue_id)
 
     result = await db.execute(
-        select(Comment, User)
-        .join(User, Comment.author_id == User.id)
+        select(Comment)
         .where(Comment.issue_id == issue_id, Comment.deleted_at.is_(None))
         .order_by(Comment.created_at.asc())
     )
+    comments = result.scalars().all()
 
-    comments_data = result.all()
+    # Resolve all authors with a single query
+    authors = await get_loader(db).load_users(comment.author_id for comment in comments)
 
-    responses = []
-    for comment, user in comments_data:
-        response = CommentResponse.from_orm(comment)
-        response.author_name = user.name
-        responses.append(response)
-
-    return responses
+    return fast_response([
+        _build_comment_response(comment, authors[comment.author_id].name)
+        for comment in comments
+    ])
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
@@ -118,13 +119,12 @@ async def update_comment(
         )
 
     comment.content = comment_update.content
+    await db.flush()
+    await reindex_issue(db, comment.issue_id)
     await db.commit()
     await db.refresh(comment)
 
-    response = CommentResponse.from_orm(comment)
-    response.author_name = current_user.name
-
-    return response
+    return _build_comment_response(comment, current_user.name)
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -158,4 +158,20 @@ async def delete_comment(
         )
 
     comment.deleted_at = datetime.utcnow()
+    await db.flush()
+    await reindex_issue(db, comment.issue_id)
     await db.commit()
+
+
+# Helper function
+def _build_comment_response(comment: Comment, author_name: str) -> dict:
+    """Build comment response with the author's name (shaped like CommentResponse)"""
+    return {
+        "content": comment.content,
+        "id": comment.id,
+        "issue_id": comment.issue_id,
+        "author_id": comment.author_id,
+        "author_name": author_name,
+        "created_at": comment.created_at,
+        "updated_at": comment.updated_at
+    }
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+
+from app.core.cache import cache_stats
+from app.core.database import engine, read_engine
+from app.core.pool import pool_stats
+from app.core.security import get_current_user
+from app.models.user import User
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/cache")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Hit rate, size and invalidation counts of the in-process caches"""
+
+    return cache_stats()
+
+
+@router.get("/pool")
+async def get_pool_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Connection pool gauges (in use, overflow) and checkout wait times"""
+
+    return {
+        "primary": pool_stats(engine.pool),
+        "read": pool_stats(read_engine.pool) if read_engine is not None else None
+    }
@@ -1,20 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, insert, delete
 from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_read_db
 from app.models.user import User
-from app.models.issue import Issue, IssueLabel, IssueLabelAssignment, Subtask, IssueHistory
+from app.models.issue import Issue, IssueStatus, IssueLabel, IssueLabelAssignment, Subtask
+from app.models.team import TeamMember
 from app.schemas.issue import (
     IssueCreate,
     IssueUpdate,
     IssueResponse,
     IssueStatusUpdate,
+    IssueSearchResult,
+    IssueBulkUpdate,
+    IssueBulkResult,
     IssueLabelCreate,
-    IssueLabelResponse,
     SubtaskCreate,
     SubtaskUpdate,
     SubtaskResponse,
@@ -27,7 +30,22 @@ from app.utils.ai_service import (
     generate_suggestion,
     check_rate_limit
 )
-from app.utils.helpers import create_notification
+from app.utils.helpers import create_notification, record_issue_change
+from app.utils.loaders import build_issue_responses
+from app.utils.search import search_issues, reindex_issue, remove_from_index
+from app.utils.ranking import (
+    rank_between,
+    rank_for_end_of_column,
+    rank_for_index,
+    rank_next_to,
+    needs_rebalance,
+    rebalance_column_in_background
+)
+from app.utils.quota import PROJECT_ISSUES, ISSUE_SUBTASKS, try_reserve, release
+from app.utils.etag import make_etag, not_modified, issue_version, project_issues_version
+from app.utils.fields import parse_fields, issue_columns
+from app.utils.serialization import fast_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/issues", tags=["Issues"])
 
@@ -43,16 +61,8 @@ async def create_issue(
     # Verify project access
     project = await verify_project_access(db, current_user.id, issue_create.project_id)
 
-    # Check issue limit (max 200 per project)
-    count_result = await db.execute(
-        select(func.count(Issue.id)).where(
-            Issue.project_id == issue_create.project_id,
-            Issue.deleted_at.is_(None)
-        )
-    )
-    issue_count = count_result.scalar()
-
-    if issue_count >= 200:
+    # Claim a slot under the issue limit (max 200 per project)
+    if not await try_reserve(db, PROJECT_ISSUES, issue_create.project_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project has reached maximum of 200 issues"
@@ -66,7 +76,8 @@ async def create_issue(
         creator_id=current_user.id,
         assignee_id=issue_create.assignee_id,
         due_date=issue_create.due_date,
-        priority=issue_create.priority
+        priority=issue_create.priority,
+        rank=await rank_for_end_of_column(db, issue_create.project_id, IssueStatus.BACKLOG.value)
     )
 
     db.add(issue)
@@ -81,8 +92,7 @@ async def create_issue(
             )
             db.add(label_assignment)
 
-    await db.commit()
-    await db.refresh(issue)
+    await reindex_issue(db, issue.id)
 
     # Send notification if assigned
     if issue.assignee_id and issue.assignee_id != current_user.id:
@@ -94,26 +104,50 @@ async def create_issue(
             issue_id=issue.id
         )
 
-    return await get_issue(issue.id, current_user, db)
+    await db.commit()
+    await db.refresh(issue)
+
+    return await _build_issue_response(db, issue)
 
 
 @router.get("", response_model=List[IssueResponse])
 async def list_issues(
+    request: Request,
+    response: Response,
     project_id: Optional[int] = None,
     status: Optional[str] = None,
     assignee_id: Optional[int] = None,
     priority: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List issues with filters"""
+    """List issues with filters, newest first
+
+    Results are keyset-paginated on (created_at, id): pass the X-Next-Cursor
+    response header back as `cursor` to get the next page. X-Total-Count is
+    only computed when `include_total` is set. Lists of a single project
+    carry an ETag and honor If-None-Match. `fields` (comma-separated) limits
+    each issue to those keys, e.g. `fields=id,title,status,assignee_name`.
+    """
+
+    requested_fields = parse_fields(fields, IssueResponse)
 
-    query = select(Issue).where(Issue.deleted_at.is_(None))
+    # Plain column rows, not entities: created_at is always read for the cursor
+    query = select(*issue_columns(requested_fields, "created_at")).where(Issue.deleted_at.is_(None))
 
     if project_id:
         await verify_project_access(db, current_user.id, project_id)
         query = query.where(Issue.project_id == project_id)
 
+        version = await project_issues_version(db, project_id)
+        cached = not_modified(request, response, make_etag(*version, str(request.query_params)))
+        if cached:
+            return cached
+
     if status:
         query = query.where(Issue.status == status)
 
@@ -123,27 +157,68 @@ async def list_issues(
     if priority:
         query = query.where(Issue.priority == priority)
 
-    result = await db.execute(query.order_by(Issue.created_at.desc()))
-    issues = result.scalars().all()
+    if include_total:
+        count_result = await db.execute(select(func.count()).select_from(query.subquery()))
+        response.headers["X-Total-Count"] = str(count_result.scalar())
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Issue.created_at, Issue.id) < (cursor_created_at, cursor_id))
 
-    # Convert to response with additional info
-    responses = []
-    for issue in issues:
-        issue_resp = await _build_issue_response(db, issue)
-        responses.append(issue_resp)
+    # Fetch one extra row to know whether there is a next page
+    result = await db.execute(
+        query.order_by(Issue.created_at.desc(), Issue.id.desc()).limit(limit + 1)
+    )
+    issues = result.all()
+
+    if len(issues) > limit:
+        issues = issues[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(issues[-1].created_at, issues[-1].id)
 
-    return responses
+    # Convert to response with additional info (batched per relation)
+    return fast_response(await build_issue_responses(db, issues, requested_fields), response)
+
+
+@router.get("/search", response_model=List[IssueSearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over issue titles, descriptions and comments
+
+    Results are ranked by relevance and limited to projects of the user's
+    teams. Matches are wrapped in <mark> tags.
+    """
+
+    return fast_response(await search_issues(db, current_user.id, q, project_id=project_id, limit=limit))
 
 
 @router.get("/{issue_id}", response_model=IssueResponse)
 async def get_issue(
     issue_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get issue details"""
+    """Get issue details (with ETag / If-None-Match and `fields` support)"""
+
+    requested_fields = parse_fields(fields, IssueResponse)
 
     issue = await verify_issue_access(db, current_user.id, issue_id)
+
+    version = await issue_version(db, issue)
+    cached = not_modified(request, response, make_etag(*version, sorted(requested_fields or ())))
+    if cached:
+        return cached
+
+    if requested_fields is not None:
+        issue_responses = await build_issue_responses(db, [issue], requested_fields)
+        return fast_response(issue_responses[0], response)
     return await _build_issue_response(db, issue)
 
 
@@ -181,11 +256,12 @@ async def update_issue(
     if issue_update.status:
         if issue.status != issue_update.status:
             changes.append(("status", issue.status, issue_update.status))
+            issue.rank = await rank_for_end_of_column(db, issue.project_id, issue_update.status)
         issue.status = issue_update.status
 
     if issue_update.priority:
         if issue.priority != issue_update.priority:
-            changes.append(("priority", issue.priority.value, issue_update.priority.value))
+            changes.append(("priority", issue.priority.value if issue.priority else None, issue_update.priority.value))
         issue.priority = issue_update.priority
 
     if issue_update.due_date is not None:
@@ -199,54 +275,201 @@ async def update_issue(
         )
         # This is simplified - in production, properly delete old labels
 
+    if issue_update.title or issue_update.description is not None:
+        await db.flush()
+        await reindex_issue(db, issue.id)
+
     # Record history
     for field, old_val, new_val in changes:
-        history = IssueHistory(
-            issue_id=issue.id,
-            user_id=current_user.id,
-            field_name=field,
-            old_value=old_val,
-            new_value=new_val
-        )
-        db.add(history)
+        record_issue_change(db, issue.id, current_user.id, field, old_val, new_val)
 
     await db.commit()
     await db.refresh(issue)
 
-    return await get_issue(issue.id, current_user, db)
+    return await _build_issue_response(db, issue)
 
 
 @router.patch("/{issue_id}/status", response_model=IssueResponse)
 async def update_issue_status(
     issue_id: int,
     status_update: IssueStatusUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update issue status (for drag & drop)"""
+    """Update issue status (for drag & drop)
+
+    The card is placed next to `after_issue_id`/`before_issue_id` (or at the
+    legacy `position` index, or at the end of the column) by giving it a new
+    rank, so only this issue's row is written.
+    """
 
     issue = await verify_issue_access(db, current_user.id, issue_id)
 
     old_status = issue.status
-    issue.status = status_update.status
+    new_rank = None
 
-    if status_update.position is not None:
+    if status_update.after_issue_id is not None or status_update.before_issue_id is not None:
+        place_after = status_update.after_issue_id is not None
+        new_rank = await rank_next_to(
+            db,
+            issue.project_id,
+            status_update.status,
+            status_update.after_issue_id if place_after else status_update.before_issue_id,
+            issue.id,
+            place_after=place_after
+        )
+        if new_rank is None:
+            # The anchor isn't ranked yet: append for now, rebalancing ranks the column
+            background_tasks.add_task(rebalance_column_in_background, issue.project_id, status_update.status)
+    elif status_update.position is not None:
         issue.position = status_update.position
+        new_rank = await rank_for_index(db, issue.project_id, status_update.status, status_update.position, issue.id)
+        if new_rank is None:
+            # Duplicate ranks at that index: append for now, rebalancing fixes the column
+            background_tasks.add_task(rebalance_column_in_background, issue.project_id, status_update.status)
+    elif old_status == status_update.status and issue.rank is not None:
+        new_rank = issue.rank
+
+    if new_rank is None:
+        new_rank = await rank_for_end_of_column(db, issue.project_id, status_update.status)
+
+    issue.status = status_update.status
+    issue.rank = new_rank
+
+    if needs_rebalance(new_rank):
+        background_tasks.add_task(rebalance_column_in_background, issue.project_id, issue.status)
 
     # Record history
-    history = IssueHistory(
-        issue_id=issue.id,
-        user_id=current_user.id,
-        field_name="status",
-        old_value=old_status,
-        new_value=status_update.status
-    )
-    db.add(history)
+    record_issue_change(db, issue.id, current_user.id, "status", old_status, status_update.status)
 
     await db.commit()
     await db.refresh(issue)
 
-    return await get_issue(issue.id, current_user, db)
+    return await _build_issue_response(db, issue)
+
+
+@router.post("/bulk", response_model=IssueBulkResult)
+async def bulk_update_issues(
+    bulk_update: IssueBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply the same change to many issues in a single transaction
+
+    Access is checked once per project, history rows are inserted in one
+    batch and everything is committed once.
+    """
+
+    issue_ids = list(dict.fromkeys(bulk_update.issue_ids))
+    result = await db.execute(
+        select(Issue).where(Issue.id.in_(issue_ids), Issue.deleted_at.is_(None))
+    )
+    # Rows come back in database order; moved cards follow the request's order
+    order = {issue_id: index for index, issue_id in enumerate(issue_ids)}
+    issues = sorted(result.scalars().all(), key=lambda issue: order[issue.id])
+
+    missing = set(issue_ids) - {issue.id for issue in issues}
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Issues not found: {sorted(missing)}"
+        )
+
+    # Verify access once per project
+    project_ids = {issue.project_id for issue in issues}
+    team_ids = set()
+    for project_id in project_ids:
+        project = await verify_project_access(db, current_user.id, project_id)
+        team_ids.add(project.team_id)
+
+    if bulk_update.delete:
+        now = datetime.utcnow()
+        for issue in issues:
+            issue.deleted_at = now
+        for project_id in project_ids:
+            await release(db, PROJECT_ISSUES, project_id, sum(issue.project_id == project_id for issue in issues))
+        await remove_from_index(db, issue_ids)
+        await db.commit()
+        return IssueBulkResult(deleted=issue_ids)
+
+    if bulk_update.assignee_id is not None:
+        # The assignee must belong to the team of every affected project
+        members_result = await db.execute(
+            select(TeamMember.team_id).where(
+                TeamMember.user_id == bulk_update.assignee_id,
+                TeamMember.team_id.in_(team_ids)
+            )
+        )
+        if set(members_result.scalars().all()) != team_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Assignee must be a member of the project's team"
+            )
+
+    def track(issue: Issue, field: str, old_value, new_value):
+        record_issue_change(db, issue.id, current_user.id, field, old_value, new_value)
+
+    if bulk_update.status:
+        # Moved cards are appended to the target column, in request order
+        last_ranks = {}
+        for issue in issues:
+            if issue.status == bulk_update.status:
+                continue
+            if issue.project_id not in last_ranks:
+                last_ranks[issue.project_id] = await rank_for_end_of_column(db, issue.project_id, bulk_update.status)
+            else:
+                last_ranks[issue.project_id] = rank_between(last_ranks[issue.project_id], None)
+            track(issue, "status", issue.status, bulk_update.status)
+            issue.status = bulk_update.status
+            issue.rank = last_ranks[issue.project_id]
+
+    if bulk_update.assignee_id is not None:
+        for issue in issues:
+            if issue.assignee_id != bulk_update.assignee_id:
+                track(issue, "assignee", str(issue.assignee_id), str(bulk_update.assignee_id))
+                issue.assignee_id = bulk_update.assignee_id
+
+    if bulk_update.priority:
+        for issue in issues:
+            if issue.priority != bulk_update.priority:
+                track(issue, "priority", issue.priority.value if issue.priority else None, bulk_update.priority.value)
+                issue.priority = bulk_update.priority
+
+    if bulk_update.remove_label_ids:
+        await db.execute(
+            delete(IssueLabelAssignment).where(
+                IssueLabelAssignment.issue_id.in_(issue_ids),
+                IssueLabelAssignment.label_id.in_(bulk_update.remove_label_ids)
+            )
+        )
+
+    if bulk_update.add_label_ids:
+        # Only labels of the issue's own project, and only where not already assigned
+        labels_result = await db.execute(
+            select(IssueLabel.id, IssueLabel.project_id).where(IssueLabel.id.in_(bulk_update.add_label_ids))
+        )
+        label_projects = dict(labels_result.all())
+        existing_result = await db.execute(
+            select(IssueLabelAssignment.issue_id, IssueLabelAssignment.label_id).where(
+                IssueLabelAssignment.issue_id.in_(issue_ids),
+                IssueLabelAssignment.label_id.in_(label_projects.keys())
+            )
+        )
+        existing = set(existing_result.all())
+
+        new_assignments = [
+            {"issue_id": issue.id, "label_id": label_id}
+            for issue in issues
+            for label_id, label_project_id in label_projects.items()
+            if label_project_id == issue.project_id and (issue.id, label_id) not in existing
+        ]
+        if new_assignments:
+            await db.execute(insert(IssueLabelAssignment), new_assignments)
+
+    await db.commit()
+
+    return IssueBulkResult(updated=issue_ids)
 
 
 @router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -262,6 +485,9 @@ async def delete_issue(
     # Check permission (creator, project owner, or team admin)
     # Simplified for now
     issue.deleted_at = datetime.utcnow()
+    await release(db, PROJECT_ISSUES, issue.project_id)
+    await db.flush()
+    await reindex_issue(db, issue.id)
     await db.commit()
 
 
@@ -360,11 +586,8 @@ async def create_subtask(
 
     await verify_issue_access(db, current_user.id, issue_id)
 
-    # Check limit (max 20 subtasks)
-    count_result = await db.execute(
-        select(func.count(Subtask.id)).where(Subtask.issue_id == issue_id)
-    )
-    if count_result.scalar() >= 20:
+    # Claim a slot under the subtask limit (max 20 per issue)
+    if not await try_reserve(db, ISSUE_SUBTASKS, issue_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Maximum 20 subtasks per issue"
@@ -383,56 +606,7 @@ async def create_subtask(
 
 
 # Helper function
-async def _build_issue_response(db: AsyncSession, issue: Issue) -> IssueResponse:
+async def _build_issue_response(db: AsyncSession, issue: Issue) -> dict:
     """Build issue response with related data"""
-
-    # Get labels
-    labels_result = await db.execute(
-        select(IssueLabel)
-        .join(IssueLabelAssignment)
-        .where(IssueLabelAssignment.issue_id == issue.id)
-    )
-    labels = labels_result.scalars().all()
-
-    # Get subtasks
-    subtasks_result = await db.execute(
-        select(Subtask).where(Subtask.issue_id == issue.id).order_by(Subtask.position)
-    )
-    subtasks = subtasks_result.scalars().all()
-
-    # Get assignee and creator names
-    assignee_name = None
-    creator_name = None
-
-    if issue.assignee_id:
-        assignee_result = await db.execute(select(User).where(User.id == issue.assignee_id))
-        assignee = assignee_result.scalar_one_or_none()
-        if assignee:
-            assignee_name = assignee.name
-
-    creator_result = await db.execute(select(User).where(User.id == issue.creator_id))
-    creator = creator_result.scalar_one_or_none()
-    if creator:
-        creator_name = creator.name
-
-    # Construct response manually to avoid lazy-loading issues
-    response = IssueResponse(
-        id=issue.id,
-        title=issue.title,
-        description=issue.description,
-        project_id=issue.project_id,
-        creator_id=issue.creator_id,
-        assignee_id=issue.assignee_id,
-        status=issue.status,
-        priority=issue.priority,
-        due_date=issue.due_date,
-        position=issue.position,
-        created_at=issue.created_at,
-        updated_at=issue.updated_at,
-        labels=[IssueLabelResponse.from_orm(label) for label in labels],
-        subtasks=[SubtaskResponse.from_orm(subtask) for subtask in subtasks],
-        assignee_name=assignee_name,
-        creator_name=creator_name
-    )
-
-    return response
+    responses = await build_issue_responses(db, [issue])
+    return responses[0]
@@ -4,10 +4,12 @@ from sqlalchemy import select, update
 from typing import List
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_read_db
 from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import NotificationResponse, NotificationMarkRead
+from app.utils.fields import response_columns
+from app.utils.serialization import fast_response, validate_many
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -16,11 +18,13 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 async def list_notifications(
     unread_only: bool = False,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List user notifications"""
 
-    query = select(Notification).where(Notification.user_id == current_user.id)
+    query = select(*response_columns(Notification, NotificationResponse)).where(
+        Notification.user_id == current_user.id
+    )
 
     if unread_only:
         query = query.where(Notification.is_read == False)
@@ -28,15 +32,15 @@ async def list_notifications(
     query = query.order_by(Notification.created_at.desc())
 
     result = await db.execute(query)
-    notifications = result.scalars().all()
+    notifications = result.all()
 
-    return notifications
+    return fast_response(validate_many(NotificationResponse, notifications))
 
 
 @router.get("/unread-count")
 async def get_unread_count(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get count of unread notifications"""
 
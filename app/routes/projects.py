@@ -1,22 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List
+from sqlalchemy import select
+from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.database import get_db, read_session_factory
+from app.core.security import get_current_user, get_read_db
 from app.models.user import User
-from app.models.project import Project, ProjectFavorite
+from app.models.project import Project, ProjectStatus, ProjectFavorite
+from app.models.issue import Issue, IssueStatus
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
-    ProjectResponse
+    ProjectResponse,
+    BoardColumn,
+    BoardResponse
 )
-from app.utils.permissions import verify_team_membership, verify_project_access, verify_project_edit_permission
+from app.utils.permissions import (
+    verify_team_membership,
+    verify_project_access,
+    verify_project_edit_permission,
+    invalidate_project
+)
+from app.utils.loaders import build_issue_responses
+from app.utils.importer import IMPORT_FORMATS, import_issues
+from app.utils.exporter import MEDIA_TYPES, iter_project_export
+from app.utils.fields import parse_fields, issue_columns, project_columns, ordered_fields
+from app.utils.serialization import fast_response, validate_many
+from app.utils.quota import TEAM_PROJECTS, try_reserve, release
+from app.utils.etag import make_etag, not_modified, project_version
+from app.schemas.issue import IssueResponse, IssueImportResult
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+DEFAULT_COLUMN_NAMES = {
+    IssueStatus.BACKLOG: "Backlog",
+    IssueStatus.IN_PROGRESS: "In Progress",
+    IssueStatus.REVIEW: "In Review",
+    IssueStatus.DONE: "Done",
+}
+
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
@@ -29,16 +53,8 @@ async def create_project(
     # Verify team membership
     await verify_team_membership(db, current_user.id, project_create.team_id)
 
-    # Check project limit (max 15 per team)
-    count_result = await db.execute(
-        select(func.count(Project.id)).where(
-            Project.team_id == project_create.team_id,
-            Project.deleted_at.is_(None)
-        )
-    )
-    project_count = count_result.scalar()
-
-    if project_count >= 15:
+    # Claim a slot under the project limit (max 15 per team)
+    if not await try_reserve(db, TEAM_PROJECTS, project_create.team_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Team has reached maximum of 15 projects"
@@ -61,13 +77,17 @@ async def create_project(
 
 @router.get("", response_model=List[ProjectResponse])
 async def list_projects(
+    response: Response,
     team_id: int = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all projects user has access to"""
+    """List all projects user has access to (`fields` limits each project to those keys)"""
 
-    query = select(Project).where(Project.deleted_at.is_(None))
+    requested_fields = parse_fields(fields, ProjectResponse)
+
+    query = select(*project_columns(requested_fields)).where(Project.deleted_at.is_(None))
 
     if team_id:
         await verify_team_membership(db, current_user.id, team_id)
@@ -80,45 +100,167 @@ async def list_projects(
         )
 
     result = await db.execute(query)
-    projects = result.scalars().all()
+    projects = result.all()
 
-    return projects
+    if requested_fields is not None:
+        names = ordered_fields(requested_fields, ProjectResponse)
+        defaults = {name: field.default for name, field in ProjectResponse.model_fields.items()}
+        return fast_response([
+            {name: getattr(project, name, defaults[name]) for name in names} for project in projects
+        ], response)
+    return fast_response(validate_many(ProjectResponse, projects), response)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get project details"""
+    """Get project details (with ETag / If-None-Match and `fields` support)"""
+
+    requested_fields = parse_fields(fields, ProjectResponse)
 
     project = await verify_project_access(db, current_user.id, project_id)
 
-    # Get issue count
-    from app.models.issue import Issue
-    count_result = await db.execute(
-        select(func.count(Issue.id)).where(
-            Issue.project_id == project_id,
-            Issue.deleted_at.is_(None)
+    # Issue count and favorite flag are part of the version lookup
+    version = await project_version(db, project, current_user.id)
+    cached = not_modified(request, response, make_etag(*version, sorted(requested_fields or ())))
+    if cached:
+        return cached
+
+    *_, issue_count, favorite_count = version
+    is_favorited = favorite_count > 0
+
+    project_response = ProjectResponse.from_orm(project)
+    project_response.issue_count = issue_count
+    project_response.is_favorited = is_favorited
+
+    if requested_fields is not None:
+        return fast_response(project_response.model_dump(include=requested_fields), response)
+    return project_response
+
+
+@router.get("/{project_id}/board", response_model=BoardResponse)
+async def get_board(
+    project_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the Kanban board: columns with their issues (in rank order), counts and WIP limit state
+
+    `fields` limits each card to those keys, e.g.
+    `fields=id,title,status,priority,assignee_name,rank` for a compact board.
+    """
+
+    requested_fields = parse_fields(fields, IssueResponse)
+
+    await verify_project_access(db, current_user.id, project_id)
+
+    # Default columns come first, then custom statuses in position order
+    statuses_result = await db.execute(
+        select(ProjectStatus)
+        .where(ProjectStatus.project_id == project_id)
+        .order_by(ProjectStatus.position, ProjectStatus.id)
+    )
+    columns = {
+        issue_status.value: BoardColumn(
+            status=issue_status.value,
+            name=DEFAULT_COLUMN_NAMES[issue_status],
+            position=index,
+            count=0
         )
+        for index, issue_status in enumerate(IssueStatus)
+    }
+    for project_status in statuses_result.scalars().all():
+        column = columns.get(project_status.name)
+        if column is None:
+            column = BoardColumn(status=project_status.name, name=project_status.name, position=len(columns), count=0)
+            columns[project_status.name] = column
+        column.color = project_status.color
+        column.wip_limit = project_status.wip_limit
+
+    # All issues in one query, already grouped by column and ordered within it
+    issues_result = await db.execute(
+        select(*issue_columns(requested_fields, "status"))  # status picks the column
+        .where(Issue.project_id == project_id, Issue.deleted_at.is_(None))
+        .order_by(Issue.status, Issue.rank, Issue.id)
     )
-    issue_count = count_result.scalar()
+    issues = issues_result.all()
+
+    column_issues = {column_status: [] for column_status in columns}
+    for issue, issue_response in zip(issues, await build_issue_responses(db, issues, requested_fields)):
+        if issue.status not in columns:
+            # Issue left in a status that no longer has a column
+            columns[issue.status] = BoardColumn(status=issue.status, name=issue.status, position=len(columns), count=0)
+            column_issues[issue.status] = []
+        column_issues[issue.status].append(issue_response)
+
+    for column_status, column in columns.items():
+        column.count = len(column_issues[column_status])
+        column.is_over_wip_limit = column.wip_limit is not None and column.count > column.wip_limit
+
+    # Cards are plain dicts (see build_issue_responses), so the board is too
+    return fast_response({
+        "project_id": project_id,
+        "columns": [
+            {**column.model_dump(exclude={"issues"}), "issues": column_issues[column_status]}
+            for column_status, column in columns.items()
+        ]
+    }, response)
+
+
+@router.post("/{project_id}/issues/import", response_model=IssueImportResult)
+async def import_project_issues(
+    project_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Import issues from a CSV or NDJSON upload
 
-    # Check if favorited
-    fav_result = await db.execute(
-        select(ProjectFavorite).where(
-            ProjectFavorite.project_id == project_id,
-            ProjectFavorite.user_id == current_user.id
+    The format defaults to the file extension. Rows are validated and inserted
+    in batches; invalid rows are reported by line number and skipped.
+    """
+
+    project = await verify_project_access(db, current_user.id, project_id)
+
+    file_format = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if file_format == "jsonl":
+        file_format = "ndjson"
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported import format, use csv or ndjson"
         )
-    )
-    is_favorited = fav_result.scalar_one_or_none() is not None
 
-    response = ProjectResponse.from_orm(project)
-    response.issue_count = issue_count
-    response.is_favorited = is_favorited
+    return await import_issues(db, project, current_user.id, file.file, file_format)
 
-    return response
+
+@router.get("/{project_id}/issues/export")
+async def export_project_issues(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Export all issues of a project as a streamed CSV or NDJSON file"""
+
+    await verify_project_access(db, current_user.id, project_id)
+
+    filename = f"project-{project_id}-issues.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        iter_project_export(project_id, format, compress=gzip, session_factory=read_session_factory(current_user.id)),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -154,6 +296,8 @@ async def delete_project(
     project = await verify_project_edit_permission(db, current_user.id, project_id)
 
     project.deleted_at = datetime.utcnow()
+    await release(db, TEAM_PROJECTS, project.team_id)
+    invalidate_project(db, project.id)
     await db.commit()
 
 
@@ -5,7 +5,7 @@ from typing import List
 from datetime import datetime
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_read_db
 from app.models.user import User
 from app.models.team import Team, TeamMember, TeamRole
 from app.models.invite import TeamInvite, InviteStatus
@@ -20,9 +20,17 @@ from app.schemas.team import (
     TeamInviteResponse,
     TeamInviteAccept
 )
-from app.utils.permissions import verify_team_membership, verify_team_admin, verify_team_owner
+from app.utils.permissions import (
+    verify_team_membership,
+    verify_team_admin,
+    verify_team_owner,
+    invalidate_membership
+)
 from app.utils.email import send_team_invite_email, generate_token
 from app.utils.helpers import log_activity
+from app.utils.fields import response_columns
+from app.utils.serialization import fast_response, validate_many
+from app.utils.loaders import get_loader
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
@@ -50,6 +58,7 @@ async def create_team(
         role=TeamRole.OWNER
     )
     db.add(team_member)
+    invalidate_membership(db, current_user.id, team.id)
 
     await db.commit()
     await db.refresh(team)
@@ -60,26 +69,28 @@ async def create_team(
 @router.get("", response_model=List[TeamResponse])
 async def list_my_teams(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all teams user belongs to"""
 
     result = await db.execute(
-        select(Team).join(TeamMember).where(
+        select(*response_columns(Team, TeamResponse, computed={"member_count": ()}))
+        .join(TeamMember, TeamMember.team_id == Team.id)
+        .where(
             TeamMember.user_id == current_user.id,
             Team.deleted_at.is_(None)
         )
     )
-    teams = result.scalars().all()
+    teams = result.all()
 
-    return teams
+    return fast_response(validate_many(TeamResponse, teams))
 
 
 @router.get("/{team_id}", response_model=TeamDetailResponse)
 async def get_team(
     team_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get team details"""
 
@@ -98,20 +109,22 @@ async def get_team(
 
     # Get members
     members_result = await db.execute(
-        select(TeamMember, User).join(User).where(TeamMember.team_id == team_id)
+        select(TeamMember).where(TeamMember.team_id == team_id)
     )
-    members_data = members_result.all()
+    team_members = members_result.scalars().all()
+    users = await get_loader(db).load_users(tm.user_id for tm in team_members)
 
     members = [
         TeamMemberResponse(
             id=tm.id,
             user_id=tm.user_id,
-            user_name=user.name,
-            user_email=user.email,
+            user_name=users[tm.user_id].name,
+            user_email=users[tm.user_id].email,
             role=tm.role,
             joined_at=tm.joined_at
         )
-        for tm, user in members_data
+        for tm in team_members
+        if tm.user_id in users
     ]
 
     return TeamDetailResponse(
@@ -174,6 +187,7 @@ async def delete_team(
         )
 
     team.deleted_at = datetime.utcnow()
+    invalidate_membership(db, None, team_id)
     await db.commit()
 
 
@@ -254,6 +268,7 @@ async def change_member_role(
         )
 
     member.role = role_update.role
+    invalidate_membership(db, user_id, team_id)
     await db.commit()
     await db.refresh(member)
 
@@ -280,7 +295,7 @@ async def kick_member(
 ):
     """Kick a member from team"""
 
-    membership = await verify_team_membership(db, current_user.id, team_id)
+    role = await verify_team_membership(db, current_user.id, team_id)
 
     # Get target member
     result = await db.execute(
@@ -298,10 +313,10 @@ async def kick_member(
         )
 
     # Permission check
-    if membership.role == TeamRole.OWNER:
+    if role == TeamRole.OWNER:
         # Owner can kick anyone
         pass
-    elif membership.role == TeamRole.ADMIN:
+    elif role == TeamRole.ADMIN:
         # Admin can only kick MEMBERs
         if target_member.role != TeamRole.MEMBER:
             raise HTTPException(
@@ -315,6 +330,7 @@ async def kick_member(
         )
 
     await db.delete(target_member)
+    invalidate_membership(db, user_id, team_id)
     await db.commit()
 
 
@@ -326,13 +342,20 @@ async def leave_team(
 ):
     """Leave a team (not allowed for OWNER)"""
 
-    membership = await verify_team_membership(db, current_user.id, team_id)
+    role = await verify_team_membership(db, current_user.id, team_id)
 
-    if membership.role == TeamRole.OWNER:
+    if role == TeamRole.OWNER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Owner cannot leave team. Delete the team or transfer ownership first."
         )
 
-    await db.delete(membership)
+    result = await db.execute(
+        select(TeamMember).where(
+            TeamMember.team_id == team_id,
+            TeamMember.user_id == current_user.id
+        )
+    )
+    await db.delete(result.scalar_one())
+    invalidate_membership(db, current_user.id, team_id)
     await db.commit()
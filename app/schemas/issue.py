@@ -74,7 +74,35 @@ class IssueUpdate(BaseModel):
 
 class IssueStatusUpdate(BaseModel):
     status: str
-    position: Optional[int] = None
+    position: Optional[int] = None  # Legacy: 0-based index in the target column
+    after_issue_id: Optional[int] = None  # Place directly below this card
+    before_issue_id: Optional[int] = None  # Place directly above this card
+
+
+class IssueBulkUpdate(BaseModel):
+    issue_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: Optional[str] = None
+    assignee_id: Optional[int] = None
+    priority: Optional[IssuePriority] = None
+    add_label_ids: Optional[List[int]] = None
+    remove_label_ids: Optional[List[int]] = None
+    delete: bool = False
+
+
+class IssueBulkResult(BaseModel):
+    updated: List[int] = []
+    deleted: List[int] = []
+
+
+class IssueImportError(BaseModel):
+    row: int  # Line number in the uploaded file
+    error: str
+
+
+class IssueImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[IssueImportError] = []  # First 100 failures only
 
 
 class IssueResponse(IssueBase):
@@ -83,6 +111,7 @@ class IssueResponse(IssueBase):
     creator_id: int
     status: str
     position: int
+    rank: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     labels: List[IssueLabelResponse] = []
@@ -94,6 +123,16 @@ class IssueResponse(IssueBase):
         from_attributes = True
 
 
+class IssueSearchResult(BaseModel):
+    id: int
+    project_id: int
+    title: str
+    status: str
+    title_highlight: str
+    snippet: str
+    rank: float  # Higher is more relevant
+
+
 # Issue History schemas
 class IssueHistoryResponse(BaseModel):
     id: int
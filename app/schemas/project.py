@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from app.schemas.issue import IssueResponse
 
 
 # Project schemas
@@ -57,3 +58,20 @@ class ProjectStatusResponse(ProjectStatusBase):
 
     class Config:
         from_attributes = True
+
+
+# Board schemas
+class BoardColumn(BaseModel):
+    status: str
+    name: str
+    color: Optional[str] = None
+    position: int
+    count: int
+    wip_limit: Optional[int] = None
+    is_over_wip_limit: bool = False
+    issues: List[IssueResponse] = []
+
+
+class BoardResponse(BaseModel):
+    project_id: int
+    columns: List[BoardColumn] = []
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from app.core.config import settings
+from app.core.metrics import timed_external
 import openai
 
 
@@ -33,6 +34,7 @@ def check_rate_limit(user_id: int) -> bool:
     return True
 
 
+@timed_external("openai", "generate_summary")
 async def generate_summary(description: str) -> str:
     """Generate 2-4 sentence summary using OpenAI"""
     if not settings.OPENAI_API_KEY:
@@ -65,6 +67,7 @@ async def generate_summary(description: str) -> str:
         raise Exception(f"AI service error: {str(e)}")
 
 
+@timed_external("openai", "generate_suggestion")
 async def generate_suggestion(title: str, description: str) -> str:
     """Generate solution suggestion using OpenAI"""
     if not settings.OPENAI_API_KEY:
@@ -97,6 +100,7 @@ async def generate_suggestion(title: str, description: str) -> str:
         raise Exception(f"AI service error: {str(e)}")
 
 
+@timed_external("openai", "recommend_labels")
 async def recommend_labels(title: str, description: str, available_labels: List[dict]) -> List[int]:
     """Recommend labels based on title and description"""
     if not settings.OPENAI_API_KEY or not available_labels:
@@ -131,6 +135,7 @@ async def recommend_labels(title: str, description: str, available_labels: List[
         return []
 
 
+@timed_external("openai", "detect_similar_issues")
 async def detect_similar_issues(title: str, existing_issues: List[dict]) -> List[int]:
     """Detect similar issues"""
     if not settings.OPENAI_API_KEY or not existing_issues:
@@ -168,6 +173,7 @@ async def detect_similar_issues(title: str, existing_issues: List[dict]) -> List
         return []
 
 
+@timed_external("openai", "summarize_comments")
 async def summarize_comments(comments: List[str]) -> dict:
     """Summarize discussion from comments"""
     if not settings.OPENAI_API_KEY or len(comments) < 5:
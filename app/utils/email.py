@@ -2,9 +2,11 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
+from app.core.metrics import timed_external
 import secrets
 
 
+@timed_external("smtp", "send_email")
 async def send_email(to_email: str, subject: str, body: str):
     """Send email using SMTP"""
     if not all([settings.SMTP_HOST, settings.SMTP_USER, settings.SMTP_PASSWORD]):
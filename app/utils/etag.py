@@ -0,0 +1,96 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.issue import Issue, IssueLabel, IssueLabelAssignment, Subtask
+from app.models.project import Project, ProjectFavorite
+from app.models.user import User
+from app.utils.quota import PROJECT_ISSUES, count_expression
+
+# Weak ETags derived from updated_at and row counts. Each version lookup is a
+# single aggregate query, so an unchanged resource costs that query plus the
+# access check and a 304, without hydrating or serializing anything.
+#
+# A version must cover every row the response shows: besides the issues and
+# their subtasks and label assignments, that is the users behind
+# creator_name/assignee_name and the assigned labels' name and color.
+
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values that describe a resource version"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this version
+
+    Otherwise the ETag is set on the (200) response and None is returned.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" match
+        weak = {candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates}
+        if "*" in candidates or etag[2:] in weak:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return None
+
+
+async def issue_version(db: AsyncSession, issue: Issue) -> tuple:
+    """Version of one issue: its own updated_at plus its subtasks, labels and users"""
+    label_ids = select(IssueLabelAssignment.label_id).where(IssueLabelAssignment.issue_id == issue.id)
+    user_ids = [user_id for user_id in (issue.creator_id, issue.assignee_id) if user_id is not None]
+
+    result = await db.execute(
+        select(
+            select(func.count(Subtask.id)).where(Subtask.issue_id == issue.id).scalar_subquery(),
+            select(func.max(Subtask.updated_at)).where(Subtask.issue_id == issue.id).scalar_subquery(),
+            select(func.count(IssueLabelAssignment.id)).where(IssueLabelAssignment.issue_id == issue.id).scalar_subquery(),
+            select(func.max(IssueLabelAssignment.id)).where(IssueLabelAssignment.issue_id == issue.id).scalar_subquery(),
+            select(func.max(IssueLabel.updated_at)).where(IssueLabel.id.in_(label_ids)).scalar_subquery(),
+            select(func.max(User.updated_at)).where(User.id.in_(user_ids)).scalar_subquery()
+        )
+    )
+    return ("issue", issue.id, issue.updated_at, *result.one())
+
+
+async def project_issues_version(db: AsyncSession, project_id: int) -> tuple:
+    """Version of all live issues of a project, with their subtasks, labels and users"""
+    live = (Issue.project_id == project_id, Issue.deleted_at.is_(None))
+    live_issue_ids = select(Issue.id).where(*live)
+    label_ids = select(IssueLabelAssignment.label_id).where(IssueLabelAssignment.issue_id.in_(live_issue_ids))
+    user_ids = select(Issue.creator_id).where(*live).union(select(Issue.assignee_id).where(*live))
+
+    result = await db.execute(
+        select(
+            count_expression(PROJECT_ISSUES, project_id),
+            select(func.max(Issue.updated_at)).where(Issue.project_id == project_id).scalar_subquery(),
+            select(func.count(Subtask.id)).where(Subtask.issue_id.in_(live_issue_ids)).scalar_subquery(),
+            select(func.max(Subtask.updated_at)).where(Subtask.issue_id.in_(live_issue_ids)).scalar_subquery(),
+            select(func.count(IssueLabelAssignment.id)).where(IssueLabelAssignment.issue_id.in_(live_issue_ids)).scalar_subquery(),
+            select(func.max(IssueLabelAssignment.id)).where(IssueLabelAssignment.issue_id.in_(live_issue_ids)).scalar_subquery(),
+            select(func.max(IssueLabel.updated_at)).where(IssueLabel.id.in_(label_ids)).scalar_subquery(),
+            select(func.max(User.updated_at)).where(User.id.in_(user_ids)).scalar_subquery()
+        )
+    )
+    return ("project-issues", project_id, *result.one())
+
+
+async def project_version(db: AsyncSession, project: Project, user_id: int) -> tuple:
+    """Version of a project response: the project row, its issue count and the user's favorite"""
+    result = await db.execute(
+        select(
+            count_expression(PROJECT_ISSUES, project.id),  # O(1) once the counter exists
+            select(func.count(ProjectFavorite.id))
+            .where(ProjectFavorite.project_id == project.id, ProjectFavorite.user_id == user_id)
+            .scalar_subquery()
+        )
+    )
+    return ("project", project.id, project.updated_at, project.is_archived, *result.one())
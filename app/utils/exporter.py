@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import AsyncSessionLocal
+from app.models.issue import Issue
+from app.utils.loaders import RequestLoader
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_BATCH_SIZE = 500
+
+# Superset of the import columns, so an export can be imported elsewhere
+EXPORT_COLUMNS = [
+    "id", "title", "description", "status", "priority", "rank",
+    "assignee_email", "creator_email", "due_date", "labels", "subtasks",
+    "created_at", "updated_at",
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def _export_rows(issues: List[Issue], loader: RequestLoader) -> List[dict]:
+    issue_ids = [issue.id for issue in issues]
+    labels = await loader.load_labels(issue_ids)
+    subtasks = await loader.load_subtasks(issue_ids)
+    users = await loader.load_users(
+        [issue.assignee_id for issue in issues] + [issue.creator_id for issue in issues]
+    )
+
+    rows = []
+    for issue in issues:
+        assignee = users.get(issue.assignee_id)
+        creator = users.get(issue.creator_id)
+        rows.append({
+            "id": issue.id,
+            "title": issue.title,
+            "description": issue.description,
+            "status": issue.status,
+            "priority": issue.priority.value if issue.priority else None,
+            "rank": issue.rank,
+            "assignee_email": assignee.email if assignee else None,
+            "creator_email": creator.email if creator else None,
+            "due_date": issue.due_date.isoformat() if issue.due_date else None,
+            "labels": [label.name for label in labels[issue.id]],
+            "subtasks": [subtask.title for subtask in subtasks[issue.id]],
+            "created_at": issue.created_at.isoformat() if issue.created_at else None,
+            "updated_at": issue.updated_at.isoformat() if issue.updated_at else None,
+        })
+    return rows
+
+
+def _encode(rows: List[dict], file_format: str, include_header: bool) -> bytes:
+    if file_format == "ndjson":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode()
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    if include_header:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            **row,
+            # Lists as "a;b;c", like the importer expects
+            "labels": ";".join(row["labels"]),
+            "subtasks": ";".join(row["subtasks"]),
+        })
+    return buffer.getvalue().encode()
+
+
+async def iter_project_export(
+    project_id: int,
+    file_format: str,
+    compress: bool = False,
+    session_factory: Optional[async_sessionmaker] = None
+) -> AsyncIterator[bytes]:
+    """Stream a project's issues as CSV or NDJSON, one batch in memory at a time
+
+    Uses its own session (from `session_factory`, the primary by default):
+    the response body is produced after the request's dependencies are gone. Rows come from a server-side cursor; related data
+    is loaded per batch with a fresh loader so nothing accumulates.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip container
+
+    def encode(rows: List[dict], include_header: bool) -> bytes:
+        chunk = _encode(rows, file_format, include_header)
+        if compressor:
+            # Sync-flush every batch so compressed bytes reach the client right away
+            return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return chunk
+
+    async with (session_factory or AsyncSessionLocal)() as session:
+        result = await session.stream_scalars(
+            select(Issue)
+            .where(Issue.project_id == project_id, Issue.deleted_at.is_(None))
+            .order_by(Issue.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        include_header = file_format == "csv"
+        async for issues in result.partitions():
+            yield encode(await _export_rows(issues, RequestLoader(session)), include_header)
+            include_header = False
+
+        if include_header:
+            # Empty project: still a valid CSV file
+            yield encode([], include_header=True)
+
+    if compressor:
+        yield compressor.flush()
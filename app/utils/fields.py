@@ -0,0 +1,83 @@
+from typing import List, Optional, Set, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+from app.models.issue import Issue
+from app.models.project import Project
+from app.schemas.issue import IssueResponse
+from app.schemas.project import ProjectResponse
+
+# Sparse fieldsets: `?fields=id,title,status` limits a response to those keys.
+# List reads select only the columns the requested fields are built from, and
+# relations (labels, subtasks, user names) are only loaded when requested.
+# Pruned rows are returned with fast_response, bypassing the response_model,
+# which would otherwise fill in (or require) the fields that were left out.
+
+# Response fields that are computed from other columns (or from no column)
+ISSUE_FIELD_COLUMNS = {
+    "labels": (),
+    "subtasks": (),
+    "assignee_name": ("assignee_id",),
+    "creator_name": ("creator_id",),
+}
+
+PROJECT_FIELD_COLUMNS = {
+    "issue_count": (),
+    "is_favorited": (),
+}
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Set[str]]:
+    """Parse a comma-separated `fields` parameter (None means every field)
+
+    `id` is always included. Unknown names are rejected with a 400.
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}"
+        )
+    return requested | {"id"}
+
+
+def response_columns(
+    model,
+    schema: Type[BaseModel],
+    fields: Optional[Set[str]] = None,
+    computed: Optional[dict] = None,
+    always: tuple = ("id",)
+) -> list:
+    """Columns of `model` needed to build `schema` responses (or only `fields` of them)
+
+    For select(*columns) list reads: rows come back as lightweight Row tuples
+    (attribute access by column name) that never enter the identity map, and
+    columns no field needs, like the ai_* texts of issues, are never read.
+    """
+    computed = computed or {}
+    names = set(always)
+    for name in (fields if fields is not None else schema.model_fields):
+        names.update(computed.get(name, (name,)))
+    return [column.class_attribute for column in inspect(model).column_attrs if column.key in names]
+
+
+def issue_columns(fields: Optional[Set[str]], *always: str) -> list:
+    """Issue columns for an IssueResponse list (see response_columns)"""
+    return response_columns(Issue, IssueResponse, fields, ISSUE_FIELD_COLUMNS, ("id",) + always)
+
+
+def project_columns(fields: Optional[Set[str]]) -> list:
+    """Project columns for a ProjectResponse list (see response_columns)"""
+    return response_columns(Project, ProjectResponse, fields, PROJECT_FIELD_COLUMNS)
+
+
+def ordered_fields(fields: Set[str], schema: Type[BaseModel]) -> List[str]:
+    """Requested fields in schema order, for a stable key order in the output"""
+    return [name for name in schema.model_fields if name in fields]
+
@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.notification import Notification
 from app.models.activity_log import ActivityLog
+from app.models.issue import IssueHistory
+from app.utils.unit_of_work import add_row
 
 
 async def create_notification(
@@ -14,17 +16,16 @@ async def create_notification(
     issue_id: Optional[int] = None,
     team_id: Optional[int] = None
 ):
-    """Create a notification for a user"""
-    notification = Notification(
+    """Create a notification for a user (inserted when the caller commits)"""
+    add_row(
+        db,
+        Notification,
         user_id=user_id,
         title=title,
         content=content,
         issue_id=issue_id,
         team_id=team_id
     )
-    db.add(notification)
-    await db.commit()
-    return notification
 
 
 async def log_activity(
@@ -36,8 +37,10 @@ async def log_activity(
     project_id: Optional[int] = None,
     target_user_id: Optional[int] = None
 ):
-    """Log a team activity"""
-    log = ActivityLog(
+    """Log a team activity (inserted when the caller commits)"""
+    add_row(
+        db,
+        ActivityLog,
         team_id=team_id,
         user_id=user_id,
         action=action,
@@ -45,9 +48,26 @@ async def log_activity(
         project_id=project_id,
         target_user_id=target_user_id
     )
-    db.add(log)
-    await db.commit()
-    return log
+
+
+def record_issue_change(
+    db: AsyncSession,
+    issue_id: int,
+    user_id: int,
+    field_name: str,
+    old_value: Optional[str],
+    new_value: Optional[str]
+):
+    """Record an issue history entry (inserted when the caller commits)"""
+    add_row(
+        db,
+        IssueHistory,
+        issue_id=issue_id,
+        user_id=user_id,
+        field_name=field_name,
+        old_value=old_value,
+        new_value=new_value
+    )
 
 
 def calculate_completion_rate(total: int, completed: int) -> float:
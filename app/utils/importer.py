@@ -0,0 +1,256 @@
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+from typing import Annotated, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import select, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.team import TeamMember
+from app.models.project import Project
+from app.models.issue import Issue, IssueStatus, IssuePriority, IssueLabel, IssueLabelAssignment, Subtask, IssueHistory
+from app.schemas.issue import IssueImportResult, IssueImportError
+from app.utils.ranking import rank_between, rank_for_end_of_column, needs_rebalance, rebalance_column
+from app.utils.search import reindex_issues
+from app.utils.quota import PROJECT_ISSUES, LIMITS, reserve_up_to
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+MAX_LABELS_PER_ISSUE = 5
+MAX_SUBTASKS_PER_ISSUE = 20
+
+
+class ImportRow(BaseModel):
+    """One issue of an import file (CSV columns or NDJSON keys)"""
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=5000)
+    status: str = Field(IssueStatus.BACKLOG.value, min_length=1, max_length=30)
+    priority: IssuePriority = IssuePriority.MEDIUM
+    assignee_email: Optional[str] = None
+    due_date: Optional[date] = None
+    labels: List[str] = Field([], max_length=MAX_LABELS_PER_ISSUE)
+    subtasks: List[Annotated[str, Field(max_length=200)]] = Field([], max_length=MAX_SUBTASKS_PER_ISSUE)
+
+    @field_validator("labels", "subtasks", mode="before")
+    @classmethod
+    def split_list(cls, value):
+        # CSV cells hold lists as "a;b;c"
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(";") if item.strip()]
+        return value or []
+
+    @field_validator("description", "assignee_email", "due_date", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def default_status(cls, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return IssueStatus.BACKLOG.value
+        return value
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def normalize_priority(cls, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return IssuePriority.MEDIUM
+        return value.upper() if isinstance(value, str) else value
+
+
+def iter_records(stream: BinaryIO, file_format: str) -> Iterator[Tuple[int, Union[dict, str]]]:
+    """Yield (line number, raw record) pairs without reading the whole file
+
+    Records that can't be read are yielded as an error message instead. Lines
+    are decoded one at a time, so a line that isn't UTF-8 only costs itself
+    in NDJSON. In CSV a quoted field may span lines, so reading stops there
+    (reported as the last error) and the rows before it are still imported.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(_decoded_lines(stream), restkey="extra_columns")
+        # On errors, line_num counts the lines read completely, not the failed one
+        try:
+            for record in reader:
+                yield reader.line_num, record
+        except UnicodeDecodeError:
+            yield reader.line_num + 1, "Not valid UTF-8; this and the following lines were not imported"
+        except csv.Error as e:
+            yield reader.line_num + 1, f"Malformed CSV ({e}); this and the following lines were not imported"
+        return
+
+    for line_number, raw_line in enumerate(stream, start=1):
+        try:
+            line = _decode_line(raw_line, line_number)
+        except UnicodeDecodeError:
+            yield line_number, "Not valid UTF-8"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else "Invalid JSON object"
+
+
+def _decode_line(raw_line: bytes, line_number: int) -> str:
+    # A byte order mark can only start the first line
+    return raw_line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+
+
+def _decoded_lines(stream: BinaryIO) -> Iterator[str]:
+    """Decoded lines of an upload; raises UnicodeDecodeError at the first invalid one"""
+    for line_number, raw_line in enumerate(stream, start=1):
+        yield _decode_line(raw_line, line_number)
+
+
+def _chunks(records: Iterator, size: int) -> Iterator[list]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def import_issues(
+    db: AsyncSession,
+    project: Project,
+    user_id: int,
+    stream: BinaryIO,
+    file_format: str
+) -> IssueImportResult:
+    """Stream-import issues into a project, validating and inserting in chunks
+
+    Each chunk is written with multi-row inserts (issues, label assignments,
+    subtasks, history) and committed on its own, so memory use doesn't grow
+    with the file and invalid rows only cost their own import.
+    """
+    report = IssueImportResult()
+
+    def reject(line_number: int, message: str):
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(IssueImportError(row=line_number, error=message))
+
+    # Project labels by (case-insensitive) name
+    labels_result = await db.execute(
+        select(IssueLabel.name, IssueLabel.id).where(IssueLabel.project_id == project.id)
+    )
+    label_ids = {name.lower(): label_id for name, label_id in labels_result.all()}
+
+    last_ranks: Dict[str, str] = {}
+
+    for chunk in _chunks(iter_records(stream, file_format), IMPORT_BATCH_SIZE):
+        rows: List[Tuple[int, ImportRow]] = []
+        for line_number, record in chunk:
+            if isinstance(record, str):
+                reject(line_number, record)
+                continue
+            try:
+                rows.append((line_number, ImportRow.model_validate(record)))
+            except ValidationError as e:
+                reject(line_number, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ))
+
+        # Assignees must be members of the project's team
+        emails = {row.assignee_email.lower() for _, row in rows if row.assignee_email}
+        assignee_ids = {}
+        if emails:
+            assignees_result = await db.execute(
+                select(func.lower(User.email), User.id)
+                .join(TeamMember, TeamMember.user_id == User.id)
+                .where(
+                    func.lower(User.email).in_(emails),
+                    TeamMember.team_id == project.team_id,
+                    User.deleted_at.is_(None)
+                )
+            )
+            assignee_ids = dict(assignees_result.all())
+
+        candidates: List[Tuple[int, ImportRow]] = []
+        for line_number, row in rows:
+            if row.assignee_email and row.assignee_email.lower() not in assignee_ids:
+                reject(line_number, f"assignee_email: {row.assignee_email} is not a member of the team")
+                continue
+            unknown_labels = [name for name in row.labels if name.lower() not in label_ids]
+            if unknown_labels:
+                reject(line_number, f"labels: unknown label(s) {', '.join(unknown_labels)}")
+                continue
+            candidates.append((line_number, row))
+
+        # Claim issue slots for the whole chunk at once; rows past the limit fail
+        granted = await reserve_up_to(db, PROJECT_ISSUES, project.id, len(candidates))
+        for line_number, _ in candidates[granted:]:
+            reject(line_number, f"Project has reached maximum of {LIMITS[PROJECT_ISSUES]} issues")
+
+        accepted: List[Tuple[ImportRow, dict]] = []
+        for _, row in candidates[:granted]:
+            # Imported issues are appended to their column in file order
+            if row.status not in last_ranks:
+                last_ranks[row.status] = await rank_for_end_of_column(db, project.id, row.status)
+            else:
+                last_ranks[row.status] = rank_between(last_ranks[row.status], None)
+
+            accepted.append((row, {
+                "title": row.title,
+                "description": row.description,
+                "project_id": project.id,
+                "creator_id": user_id,
+                "assignee_id": assignee_ids.get(row.assignee_email.lower()) if row.assignee_email else None,
+                "status": row.status,
+                "priority": row.priority,
+                "due_date": row.due_date,
+                "rank": last_ranks[row.status],
+            }))
+
+        if not accepted:
+            continue
+
+        result = await db.execute(
+            insert(Issue).returning(Issue.id, sort_by_parameter_order=True),
+            [values for _, values in accepted]
+        )
+        issue_ids = result.scalars().all()
+
+        label_rows = []
+        subtask_rows = []
+        history_rows = []
+        now = datetime.utcnow()
+        for issue_id, (row, _) in zip(issue_ids, accepted):
+            for name in dict.fromkeys(name.lower() for name in row.labels):
+                label_rows.append({"issue_id": issue_id, "label_id": label_ids[name]})
+            for position, title in enumerate(row.subtasks):
+                subtask_rows.append({"issue_id": issue_id, "title": title, "position": position})
+            history_rows.append({
+                "issue_id": issue_id,
+                "user_id": user_id,
+                "field_name": "import",
+                "old_value": None,
+                "new_value": file_format,
+                "changed_at": now
+            })
+
+        if label_rows:
+            await db.execute(insert(IssueLabelAssignment), label_rows)
+        if subtask_rows:
+            await db.execute(insert(Subtask), subtask_rows)
+        await db.execute(insert(IssueHistory), history_rows)
+        await reindex_issues(db, issue_ids)
+
+        await db.commit()
+        report.imported += len(issue_ids)
+
+    # Long runs of appends make long ranks
+    for column_status, last_rank in last_ranks.items():
+        if needs_rebalance(last_rank):
+            await rebalance_column(db, project.id, column_status)
+
+    return report
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from sqlalchemy import Row, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.issue import Issue, IssueLabel, IssueLabelAssignment, Subtask
+from app.schemas.issue import IssueResponse
+from app.utils.fields import ordered_fields
+
+LOADER_KEY = "request_loader"
+
+
+class RequestLoader:
+    """Request-scoped batch loader for data related to issues.
+
+    Collects the keys needed by all rows of a response, fetches each relation
+    with a single IN (...) query and memoizes the results, so later lookups in
+    the same request don't touch the database again.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._users: Dict[int, User] = {}
+        self._labels: Dict[int, List[IssueLabel]] = {}
+        self._subtasks: Dict[int, List[Subtask]] = {}
+
+    async def load_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Load users by id (missing ids are simply absent from the result)"""
+        wanted = {user_id for user_id in user_ids if user_id is not None}
+        missing = wanted - self._users.keys()
+
+        if missing:
+            result = await self.db.execute(select(User).where(User.id.in_(missing)))
+            for user in result.scalars().all():
+                self._users[user.id] = user
+
+        return {user_id: self._users[user_id] for user_id in wanted if user_id in self._users}
+
+    async def load_labels(self, issue_ids: Iterable[int]) -> Dict[int, List[IssueLabel]]:
+        """Load labels grouped by issue id"""
+        wanted = set(issue_ids)
+        missing = wanted - self._labels.keys()
+
+        if missing:
+            result = await self.db.execute(
+                select(IssueLabelAssignment.issue_id, IssueLabel)
+                .join(IssueLabel, IssueLabelAssignment.label_id == IssueLabel.id)
+                .where(IssueLabelAssignment.issue_id.in_(missing))
+            )
+            grouped = defaultdict(list)
+            for issue_id, label in result.all():
+                grouped[issue_id].append(label)
+            for issue_id in missing:
+                self._labels[issue_id] = grouped.get(issue_id, [])
+
+        return {issue_id: self._labels[issue_id] for issue_id in wanted}
+
+    async def load_subtasks(self, issue_ids: Iterable[int]) -> Dict[int, List[Subtask]]:
+        """Load subtasks grouped by issue id, ordered by position"""
+        wanted = set(issue_ids)
+        missing = wanted - self._subtasks.keys()
+
+        if missing:
+            result = await self.db.execute(
+                select(Subtask)
+                .where(Subtask.issue_id.in_(missing))
+                .order_by(Subtask.issue_id, Subtask.position)
+            )
+            grouped = defaultdict(list)
+            for subtask in result.scalars().all():
+                grouped[subtask.issue_id].append(subtask)
+            for issue_id in missing:
+                self._subtasks[issue_id] = grouped.get(issue_id, [])
+
+        return {issue_id: self._subtasks[issue_id] for issue_id in wanted}
+
+    def clear(self):
+        """Forget everything loaded so far"""
+        self._users.clear()
+        self._labels.clear()
+        self._subtasks.clear()
+
+
+def get_loader(db: AsyncSession) -> RequestLoader:
+    """Get the loader bound to this request's session, creating it on first use"""
+    loader = db.info.get(LOADER_KEY)
+    if loader is None:
+        loader = RequestLoader(db)
+        db.info[LOADER_KEY] = loader
+    return loader
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_loader_on_commit(session: Session):
+    # Data written in this request must be visible to the next hydration
+    loader = session.info.get(LOADER_KEY)
+    if loader is not None:
+        loader.clear()
+
+
+async def build_issue_responses(
+    db: AsyncSession,
+    issues: Sequence[Union[Issue, Row]],
+    fields: Optional[Set[str]] = None
+) -> List[dict]:
+    """Build issue responses with related data using one query per relation
+
+    `issues` may be ORM issues or column rows from select(*issue_columns(...)).
+    Responses are plain dicts shaped like IssueResponse: every value comes straight
+    from the database, so they aren't validated again (return lists with
+    fast_response). With a sparse fieldset only those keys are built and
+    relations that weren't requested are not loaded at all.
+    """
+    if not issues:
+        return []
+
+    def wanted(name: str) -> bool:
+        return fields is None or name in fields
+
+    loader = get_loader(db)
+    issue_ids = [issue.id for issue in issues]
+
+    labels = await loader.load_labels(issue_ids) if wanted("labels") else {}
+    subtasks = await loader.load_subtasks(issue_ids) if wanted("subtasks") else {}
+    user_ids = []
+    if wanted("assignee_name"):
+        user_ids += [issue.assignee_id for issue in issues]
+    if wanted("creator_name"):
+        user_ids += [issue.creator_id for issue in issues]
+    users = await loader.load_users(user_ids) if user_ids else {}
+
+    if fields is not None:
+        names = ordered_fields(fields, IssueResponse)
+        return [_sparse_issue(issue, names, labels, subtasks, users) for issue in issues]
+
+    responses = []
+    for issue in issues:
+        assignee = users.get(issue.assignee_id)
+        creator = users.get(issue.creator_id)
+
+        # Construct response manually to avoid lazy-loading issues
+        responses.append({
+            "title": issue.title,
+            "description": issue.description,
+            "assignee_id": issue.assignee_id,
+            "due_date": issue.due_date,
+            "priority": issue.priority,
+            "id": issue.id,
+            "project_id": issue.project_id,
+            "creator_id": issue.creator_id,
+            "status": issue.status,
+            "position": issue.position,
+            "rank": issue.rank,
+            "created_at": issue.created_at,
+            "updated_at": issue.updated_at,
+            "labels": [_label_row(label) for label in labels[issue.id]],
+            "subtasks": [_subtask_row(subtask) for subtask in subtasks[issue.id]],
+            "assignee_name": assignee.name if assignee else None,
+            "creator_name": creator.name if creator else None
+        })
+
+    return responses
+
+
+def _sparse_issue(issue: Union[Issue, Row], names: List[str], labels: dict, subtasks: dict, users: dict) -> dict:
+    # Only touches requested attributes, the others may not have been loaded
+    row = {}
+    for name in names:
+        if name == "labels":
+            row[name] = [_label_row(label) for label in labels[issue.id]]
+        elif name == "subtasks":
+            row[name] = [_subtask_row(subtask) for subtask in subtasks[issue.id]]
+        elif name == "assignee_name":
+            assignee = users.get(issue.assignee_id)
+            row[name] = assignee.name if assignee else None
+        elif name == "creator_name":
+            creator = users.get(issue.creator_id)
+            row[name] = creator.name if creator else None
+        else:
+            row[name] = getattr(issue, name)
+    return row
+
+
+def _label_row(label: IssueLabel) -> dict:
+    # Shaped like IssueLabelResponse
+    return {"name": label.name, "color": label.color, "id": label.id, "project_id": label.project_id}
+
+
+def _subtask_row(subtask: Subtask) -> dict:
+    # Shaped like SubtaskResponse
+    return {
+        "title": subtask.title,
+        "id": subtask.id,
+        "issue_id": subtask.issue_id,
+        "is_completed": subtask.is_completed,
+        "position": subtask.position,
+        "created_at": subtask.created_at
+    }
@@ -1,90 +1,173 @@
+from typing import Optional, Tuple
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_
+from app.core.cache import LRUCache, invalidate_on_commit
+from app.core.config import settings
 from app.models.team import Team, TeamMember, TeamRole
 from app.models.project import Project
 from app.models.issue import Issue
 from app.models.user import User
 
+# Access-control facts shared across requests. Only positive answers are
+# cached (a role, a live project's team, an issue's project), so a cache can
+# grant access for at most the TTL after a change another process made;
+# changes made here are invalidated as soon as they commit.
+role_cache = LRUCache("team_roles", settings.ACL_CACHE_SIZE, settings.ACL_CACHE_TTL)  # (user_id, team_id) -> role
+project_team_cache = LRUCache("project_teams", settings.ACL_CACHE_SIZE, settings.ACL_CACHE_TTL)  # live project -> team
+issue_project_cache = LRUCache("issue_projects", settings.ACL_CACHE_SIZE, settings.ACL_CACHE_TTL)  # issue -> project
+
+# Roles resolved during a request, kept on the session so later checks in
+# the same request cost nothing even if the shared entry expires meanwhile
+ROLES_KEY = "team_roles"
+
+
+def _remember_role(db: AsyncSession, user_id: int, team_id: int, role: TeamRole):
+    db.info.setdefault(ROLES_KEY, {})[(user_id, team_id)] = role
+    role_cache.set((user_id, team_id), role)
+
+
+def _known_role(db: AsyncSession, user_id: int, team_id: int) -> Optional[TeamRole]:
+    role = db.info.get(ROLES_KEY, {}).get((user_id, team_id))
+    if role is None:
+        role = role_cache.get((user_id, team_id))
+    return role
+
+
+def invalidate_membership(db: AsyncSession, user_id: Optional[int], team_id: int):
+    """Forget a cached role (user_id None: every member of the team)
+
+    Shared caches are updated once the current transaction commits.
+    """
+    roles = db.info.get(ROLES_KEY, {})
+    for user, team in list(roles):
+        if team == team_id and user_id in (None, user):
+            del roles[(user, team)]
+    invalidate_on_commit(db, role_cache, (user_id, team_id))
+
+
+def invalidate_project(db: AsyncSession, project_id: int):
+    """Forget a cached project (e.g. on deletion) once the transaction commits"""
+    invalidate_on_commit(db, project_team_cache, project_id)
+
+
+def _not_a_member() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Team not found or you are not a member"
+    )
+
+
+async def verify_team_membership(db: AsyncSession, user_id: int, team_id: int) -> TeamRole:
+    """Verify user is a member of the team and return their role"""
+    role = _known_role(db, user_id, team_id)
+    if role:
+        return role
 
-async def verify_team_membership(db: AsyncSession, user_id: int, team_id: int) -> TeamMember:
-    """Verify user is a member of the team"""
     result = await db.execute(
-        select(TeamMember).where(
+        select(TeamMember.role).where(
             TeamMember.team_id == team_id,
             TeamMember.user_id == user_id
         )
     )
-    membership = result.scalar_one_or_none()
+    role = result.scalar_one_or_none()
 
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Team not found or you are not a member"
-        )
+    if not role:
+        raise _not_a_member()
 
-    return membership
+    _remember_role(db, user_id, team_id, role)
+    return role
 
 
-async def verify_team_admin(db: AsyncSession, user_id: int, team_id: int) -> TeamMember:
+async def verify_team_admin(db: AsyncSession, user_id: int, team_id: int) -> TeamRole:
     """Verify user is OWNER or ADMIN of the team"""
-    membership = await verify_team_membership(db, user_id, team_id)
+    role = await verify_team_membership(db, user_id, team_id)
 
-    if membership.role not in [TeamRole.OWNER, TeamRole.ADMIN]:
+    if role not in [TeamRole.OWNER, TeamRole.ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to perform this action"
         )
 
-    return membership
+    return role
 
 
-async def verify_team_owner(db: AsyncSession, user_id: int, team_id: int) -> TeamMember:
+async def verify_team_owner(db: AsyncSession, user_id: int, team_id: int) -> TeamRole:
     """Verify user is OWNER of the team"""
-    membership = await verify_team_membership(db, user_id, team_id)
+    role = await verify_team_membership(db, user_id, team_id)
 
-    if membership.role != TeamRole.OWNER:
+    if role != TeamRole.OWNER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only team owner can perform this action"
         )
 
-    return membership
+    return role
 
 
-async def verify_project_access(db: AsyncSession, user_id: int, project_id: int) -> Project:
-    """Verify user has access to the project"""
+def _project_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Project not found"
+    )
+
+
+async def _verify_project_membership(db: AsyncSession, user_id: int, project_id: int) -> Tuple[Project, TeamRole]:
+    """Load a project and the user's role in its team
+
+    One query either way: just the project when the role is already known,
+    otherwise the project joined with the membership.
+    """
+    team_id = project_team_cache.get(project_id)
+    role = _known_role(db, user_id, team_id) if team_id is not None else None
+
+    if role:
+        result = await db.execute(
+            select(Project).where(
+                Project.id == project_id,
+                Project.deleted_at.is_(None)
+            )
+        )
+        project = result.scalar_one_or_none()
+        if not project:
+            raise _project_not_found()
+        return project, role
+
     result = await db.execute(
-        select(Project).where(
+        select(Project, TeamMember.role)
+        .outerjoin(TeamMember, and_(TeamMember.team_id == Project.team_id, TeamMember.user_id == user_id))
+        .where(
             Project.id == project_id,
             Project.deleted_at.is_(None)
         )
     )
-    project = result.scalar_one_or_none()
+    row = result.first()
 
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+    if not row:
+        raise _project_not_found()
+
+    project, role = row
+    project_team_cache.set(project.id, project.team_id)
+    if not role:
+        raise _not_a_member()
+
+    _remember_role(db, user_id, project.team_id, role)
+    return project, role
 
-    # Verify team membership
-    await verify_team_membership(db, user_id, project.team_id)
 
+async def verify_project_access(db: AsyncSession, user_id: int, project_id: int) -> Project:
+    """Verify user has access to the project"""
+    project, _ = await _verify_project_membership(db, user_id, project_id)
     return project
 
 
 async def verify_project_edit_permission(db: AsyncSession, user_id: int, project_id: int) -> Project:
     """Verify user can edit the project (OWNER, ADMIN, or project owner)"""
-    project = await verify_project_access(db, user_id, project_id)
+    project, role = await _verify_project_membership(db, user_id, project_id)
 
-    # Check if user is project owner
-    if project.owner_id == user_id:
-        return project
-
-    # Check if user is team OWNER or ADMIN
-    membership = await verify_team_membership(db, user_id, project.team_id)
-    if membership.role in [TeamRole.OWNER, TeamRole.ADMIN]:
+    # Project owner or team OWNER / ADMIN
+    if project.owner_id == user_id or role in [TeamRole.OWNER, TeamRole.ADMIN]:
         return project
 
     raise HTTPException(
@@ -94,22 +177,56 @@ async def verify_project_edit_permission(db: AsyncSession, user_id: int, project
 
 
 async def verify_issue_access(db: AsyncSession, user_id: int, issue_id: int) -> Issue:
-    """Verify user has access to the issue"""
+    """Verify user has access to the issue
+
+    With the issue's project, that project's team and the user's role cached,
+    only the issue itself is read. Otherwise issue, project and membership
+    are resolved with a single joined query.
+    """
+    project_id = issue_project_cache.get(issue_id)
+    team_id = project_team_cache.get(project_id) if project_id is not None else None
+    role = _known_role(db, user_id, team_id) if team_id is not None else None
+
+    if role:
+        result = await db.execute(
+            select(Issue).where(
+                Issue.id == issue_id,
+                Issue.deleted_at.is_(None)
+            )
+        )
+        issue = result.scalar_one_or_none()
+        if not issue:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Issue not found"
+            )
+        return issue
+
     result = await db.execute(
-        select(Issue).where(
+        select(Issue, Project.team_id, TeamMember.role)
+        .outerjoin(Project, and_(Project.id == Issue.project_id, Project.deleted_at.is_(None)))
+        .outerjoin(TeamMember, and_(TeamMember.team_id == Project.team_id, TeamMember.user_id == user_id))
+        .where(
             Issue.id == issue_id,
             Issue.deleted_at.is_(None)
         )
     )
-    issue = result.scalar_one_or_none()
+    row = result.first()
 
-    if not issue:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Issue not found"
         )
 
-    # Verify project access (which also verifies team membership)
-    await verify_project_access(db, user_id, issue.project_id)
+    issue, team_id, role = row
+    if team_id is None:
+        raise _project_not_found()
+
+    issue_project_cache.set(issue.id, issue.project_id)
+    project_team_cache.set(issue.project_id, team_id)
+    if not role:
+        raise _not_a_member()
 
+    _remember_role(db, user_id, team_id, role)
     return issue
@@ -0,0 +1,147 @@
+import asyncio
+import enum
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import select, insert, delete, update, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.archive import ArchivedRow
+from app.models.comment import Comment
+from app.models.issue import Issue, IssueLabelAssignment, Subtask, IssueHistory
+from app.models.notification import Notification
+from app.models.quota import QuotaCounter
+from app.utils.quota import ISSUE_SUBTASKS
+
+# Purge job: rows soft-deleted more than PURGE_AFTER_DAYS ago are moved to
+# archived_rows, one bounded batch (and transaction) at a time, so live tables
+# and their indexes only hold rows that can still be read.
+#
+# Issues take their dependent rows with them (comments, subtasks, labels,
+# history); notifications about them are kept, without the link. Projects,
+# teams and users are small and referenced from everywhere, so they stay.
+
+logger = logging.getLogger(__name__)
+
+# Rows that reference an issue, archived together with it
+ISSUE_DEPENDENTS = (Comment, Subtask, IssueLabelAssignment, IssueHistory)
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+async def _archive_rows(db: AsyncSession, table: Table, where, deleted_at: Optional[datetime] = None) -> int:
+    """Copy matching rows into archived_rows and delete them; returns how many moved"""
+    result = await db.execute(select(table).where(where))
+    rows = result.mappings().all()
+    if not rows:
+        return 0
+
+    await db.execute(insert(ArchivedRow), [
+        {
+            "table_name": table.name,
+            "row_id": row["id"],
+            "data": {key: _json_value(value) for key, value in row.items()},
+            "deleted_at": row.get("deleted_at") or deleted_at,
+            "archived_at": datetime.utcnow(),
+        }
+        for row in rows
+    ])
+    await db.execute(delete(table).where(table.c.id.in_([row["id"] for row in rows])))
+    return len(rows)
+
+
+async def purge_issues_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Archive up to `batch_size` issues deleted before `cutoff`, with their dependents"""
+    result = await db.execute(
+        select(Issue.id, Issue.deleted_at)
+        .where(Issue.deleted_at < cutoff)
+        .order_by(Issue.deleted_at)
+        .limit(batch_size)
+    )
+    deleted_at = dict(result.all())
+    if not deleted_at:
+        return 0
+    issue_ids = list(deleted_at)
+    oldest = min(deleted_at.values())
+
+    for model in ISSUE_DEPENDENTS:
+        await _archive_rows(db, model.__table__, model.issue_id.in_(issue_ids), deleted_at=oldest)
+    await db.execute(
+        update(Notification).where(Notification.issue_id.in_(issue_ids)).values(issue_id=None)
+    )
+    await db.execute(
+        delete(QuotaCounter).where(QuotaCounter.scope == ISSUE_SUBTASKS, QuotaCounter.owner_id.in_(issue_ids))
+    )
+    return await _archive_rows(db, Issue.__table__, Issue.id.in_(issue_ids))
+
+
+async def purge_comments_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Archive up to `batch_size` comments deleted before `cutoff`"""
+    result = await db.execute(
+        select(Comment.id).where(Comment.deleted_at < cutoff).order_by(Comment.deleted_at).limit(batch_size)
+    )
+    comment_ids = list(result.scalars().all())
+    if not comment_ids:
+        return 0
+    return await _archive_rows(db, Comment.__table__, Comment.id.in_(comment_ids))
+
+
+async def purge_soft_deleted(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    stop: Optional[asyncio.Event] = None
+) -> Dict[str, int]:
+    """Archive everything soft-deleted more than `older_than_days` ago
+
+    Each batch is its own transaction (and session), so the job never holds
+    the database for long. Once `stop` is set, returns after the current
+    batch. Returns the number of archived issues and comments.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days if older_than_days is not None else settings.PURGE_AFTER_DAYS)
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    archived = {"issues": 0, "comments": 0}
+
+    for name, purge_batch in (("issues", purge_issues_batch), ("comments", purge_comments_batch)):
+        while True:
+            async with AsyncSessionLocal() as session:
+                count = await purge_batch(session, cutoff, batch_size)
+                await session.commit()
+            archived[name] += count
+            if stop is not None and stop.is_set():
+                return archived
+            if count < batch_size:
+                break
+            await asyncio.sleep(0)  # Let requests in between batches
+
+    return archived
+
+
+async def purge_periodically(stop: asyncio.Event):
+    """Run purge_soft_deleted every PURGE_INTERVAL_SECONDS until `stop` is set
+
+    Started by the app's lifespan. Stopping waits for the current batch (not
+    the rest of the backlog) instead of cancelling it halfway through a
+    transaction.
+    """
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.PURGE_INTERVAL_SECONDS)
+            break
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            archived = await purge_soft_deleted(stop=stop)
+            if any(archived.values()):
+                logger.info("purge archived issues=%d comments=%d", archived["issues"], archived["comments"])
+        except Exception:
+            logger.exception("purge failed")
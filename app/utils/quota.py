@@ -0,0 +1,126 @@
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.quota import QuotaCounter
+from app.models.project import Project
+from app.models.issue import Issue, Subtask
+
+# Per-parent limits, enforced with conditional UPDATEs on a counter row:
+# "value = value + 1 WHERE value < limit" either claims a slot or changes
+# nothing, so concurrent creates can't overshoot. Counters are created on first
+# use from a COUNT(*), which also covers rows that existed before counters did.
+TEAM_PROJECTS = "team_projects"
+PROJECT_ISSUES = "project_issues"
+ISSUE_SUBTASKS = "issue_subtasks"
+
+LIMITS = {
+    TEAM_PROJECTS: 15,
+    PROJECT_ISSUES: 200,
+    ISSUE_SUBTASKS: 20,
+}
+
+# What each counter counts, for the initial value
+_SOURCES = {
+    TEAM_PROJECTS: lambda owner_id: select(func.count(Project.id)).where(
+        Project.team_id == owner_id, Project.deleted_at.is_(None)
+    ),
+    PROJECT_ISSUES: lambda owner_id: select(func.count(Issue.id)).where(
+        Issue.project_id == owner_id, Issue.deleted_at.is_(None)
+    ),
+    ISSUE_SUBTASKS: lambda owner_id: select(func.count(Subtask.id)).where(
+        Subtask.issue_id == owner_id
+    ),
+}
+
+
+def _counter(scope: str, owner_id: int):
+    return (QuotaCounter.scope == scope, QuotaCounter.owner_id == owner_id)
+
+
+async def _create_counter(db: AsyncSession, scope: str, owner_id: int):
+    """Create a missing counter from COUNT(*); a concurrent creator wins ties"""
+    count_result = await db.execute(_SOURCES[scope](owner_id))
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    await db.execute(
+        dialect.insert(QuotaCounter)
+        .values(scope=scope, owner_id=owner_id, value=count_result.scalar())
+        .on_conflict_do_nothing(index_elements=["scope", "owner_id"])
+    )
+
+
+async def try_reserve(db: AsyncSession, scope: str, owner_id: int, count: int = 1) -> bool:
+    """Claim `count` slots under the limit, all or nothing
+
+    Runs in the caller's transaction: rolling back releases the slots.
+    """
+    statement = (
+        update(QuotaCounter)
+        .where(*_counter(scope, owner_id), QuotaCounter.value + count <= LIMITS[scope])
+        .values(value=QuotaCounter.value + count)
+    )
+    result = await db.execute(statement)
+    if result.rowcount:
+        return True
+
+    # Either the limit is reached or the counter doesn't exist yet
+    exists = await db.execute(select(QuotaCounter.id).where(*_counter(scope, owner_id)))
+    if exists.scalar() is not None:
+        return False
+
+    await _create_counter(db, scope, owner_id)
+    result = await db.execute(statement)
+    return bool(result.rowcount)
+
+
+async def reserve_up_to(db: AsyncSession, scope: str, owner_id: int, count: int) -> int:
+    """Claim as many of `count` slots as are left and return how many were claimed"""
+    while count > 0:
+        value = await current_count(db, scope, owner_id)
+        wanted = min(count, LIMITS[scope] - value)
+        if wanted <= 0:
+            return 0
+
+        # Compare-and-set, retried if a concurrent create got in between
+        result = await db.execute(
+            update(QuotaCounter)
+            .where(*_counter(scope, owner_id), QuotaCounter.value == value)
+            .values(value=QuotaCounter.value + wanted)
+        )
+        if result.rowcount:
+            return wanted
+    return 0
+
+
+async def release(db: AsyncSession, scope: str, owner_id: int, count: int = 1):
+    """Give back slots after a (soft) delete, in the same transaction as the delete"""
+    if count <= 0:
+        return
+    # No counter yet: nothing to do, it will be counted on first use
+    await db.execute(
+        update(QuotaCounter)
+        .where(*_counter(scope, owner_id))
+        .values(value=QuotaCounter.value - count)
+    )
+
+
+async def current_count(db: AsyncSession, scope: str, owner_id: int) -> int:
+    """Current value of a counter, creating it if needed"""
+    result = await db.execute(select(QuotaCounter.value).where(*_counter(scope, owner_id)))
+    value = result.scalar()
+    if value is None:
+        await _create_counter(db, scope, owner_id)
+        result = await db.execute(select(QuotaCounter.value).where(*_counter(scope, owner_id)))
+        value = result.scalar()
+    return value
+
+
+def count_expression(scope: str, owner_id):
+    """SQL expression for a counter, falling back to COUNT(*) before it exists
+
+    COALESCE only evaluates the COUNT(*) when the counter row is missing.
+    """
+    return func.coalesce(
+        select(QuotaCounter.value).where(*_counter(scope, owner_id)).scalar_subquery(),
+        _SOURCES[scope](owner_id).scalar_subquery()
+    )
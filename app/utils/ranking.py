@@ -0,0 +1,199 @@
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.issue import Issue
+
+# Rank strings are base-36 fractions in (0, 1): "i" sorts between "4" and "v",
+# and there is always room for another key between two neighbours, so moving a
+# card only rewrites that card's rank. Digits and lowercase letters only, so
+# the order is the same under byte-wise and locale-aware collations.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Keys grow by about one character per repeated insert into the same gap;
+# past this length the column is rebalanced in the background.
+REBALANCE_LENGTH = 24
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """Return a rank strictly between two ranks (None means the column edge)"""
+    before = before or ""
+    if after is not None and before >= after:
+        raise ValueError(f"Invalid rank range: {before!r} >= {after!r}")
+    return _midpoint(before, after)
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    # Keys never end with "0", otherwise "a" and "a0" would be equal fractions
+    if high is not None:
+        # Copy the common prefix, then find the midpoint of what follows
+        prefix = 0
+        while prefix < len(high) and (low[prefix] if prefix < len(low) else "0") == high[prefix]:
+            prefix += 1
+        if prefix > 0:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else len(DIGITS)
+
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high) // 2]
+
+    # Adjacent digits: keep the low digit and recurse into the next position
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def spread_ranks(count: int) -> List[str]:
+    """Evenly spaced ranks for a freshly rebalanced column"""
+    width = 1
+    while len(DIGITS) ** width <= count:
+        width += 1
+    width += 1  # Leave room between neighbours
+    step = len(DIGITS) ** width // (count + 1)
+
+    ranks = []
+    for index in range(1, count + 1):
+        value = step * index
+        key = ""
+        for _ in range(width):
+            value, digit = divmod(value, len(DIGITS))
+            key = DIGITS[digit] + key
+        ranks.append(key.rstrip("0"))
+    return ranks
+
+
+async def rank_for_end_of_column(db: AsyncSession, project_id: int, status: str) -> str:
+    """Rank that places an issue after every other issue in the column"""
+    result = await db.execute(
+        select(Issue.rank)
+        .where(
+            Issue.project_id == project_id,
+            Issue.status == status,
+            Issue.deleted_at.is_(None),
+            Issue.rank.is_not(None)
+        )
+        .order_by(Issue.rank.desc())
+        .limit(1)
+    )
+    return rank_between(result.scalar(), None)
+
+
+async def rank_for_index(db: AsyncSession, project_id: int, status: str, index: int, exclude_id: int) -> Optional[str]:
+    """Rank that places an issue at a 0-based index of the column (legacy integer positions)
+
+    Returns None if the neighbours at that index share a rank (two concurrent
+    appends can store the same one): there is no key between them until the
+    column is rebalanced.
+    """
+    result = await db.execute(
+        select(Issue.rank)
+        .where(
+            Issue.project_id == project_id,
+            Issue.status == status,
+            Issue.deleted_at.is_(None),
+            Issue.rank.is_not(None),
+            Issue.id != exclude_id
+        )
+        .order_by(Issue.rank)
+        .offset(max(index - 1, 0))
+        .limit(2)
+    )
+    neighbours = result.scalars().all()
+
+    if not neighbours and index > 0:
+        return await rank_for_end_of_column(db, project_id, status)
+    if index <= 0:
+        return rank_between(None, neighbours[0] if neighbours else None)
+    before = neighbours[0] if neighbours else None
+    after = neighbours[1] if len(neighbours) > 1 else None
+    if before is not None and after is not None and before >= after:
+        return None
+    return rank_between(before, after)
+
+
+async def rank_next_to(
+    db: AsyncSession,
+    project_id: int,
+    status: str,
+    anchor_id: int,
+    exclude_id: int,
+    place_after: bool
+) -> Optional[str]:
+    """Rank right after (or right before) an anchor issue of the column
+
+    The other neighbour is read from the database rather than trusted from the
+    client, so concurrent moves in the same column never produce an invalid
+    range. Returns None if the anchor isn't a ranked issue of that column.
+    """
+    in_column = (
+        Issue.project_id == project_id,
+        Issue.status == status,
+        Issue.deleted_at.is_(None)
+    )
+    anchor_result = await db.execute(select(Issue.rank).where(Issue.id == anchor_id, *in_column))
+    anchor_rank = anchor_result.scalar()
+    if anchor_rank is None:
+        return None
+
+    neighbour_query = select(Issue.rank).where(*in_column, Issue.id != exclude_id)
+    if place_after:
+        neighbour_query = neighbour_query.where(Issue.rank > anchor_rank).order_by(Issue.rank)
+    else:
+        neighbour_query = neighbour_query.where(Issue.rank < anchor_rank).order_by(Issue.rank.desc())
+    neighbour_result = await db.execute(neighbour_query.limit(1))
+    neighbour_rank = neighbour_result.scalar()
+
+    if place_after:
+        return rank_between(anchor_rank, neighbour_rank)
+    return rank_between(neighbour_rank, anchor_rank)
+
+
+async def rebalance_column(db: AsyncSession, project_id: int, status: str):
+    """Rewrite the ranks of a column evenly, keeping the current order
+
+    Unranked issues (created before ranks existed) go last, in position order.
+    """
+    result = await db.execute(
+        select(Issue.id)
+        .where(
+            Issue.project_id == project_id,
+            Issue.status == status,
+            Issue.deleted_at.is_(None)
+        )
+        .order_by(Issue.rank.is_(None), Issue.rank, Issue.position, Issue.id)
+    )
+    issue_ids = result.scalars().all()
+    if not issue_ids:
+        return
+
+    await db.execute(
+        update(Issue),
+        [{"id": issue_id, "rank": rank} for issue_id, rank in zip(issue_ids, spread_ranks(len(issue_ids)))]
+    )
+    await db.commit()
+
+
+async def rebalance_unranked_columns(db: AsyncSession):
+    """Rebalance every column that still contains unranked issues"""
+    result = await db.execute(
+        select(Issue.project_id, Issue.status)
+        .where(Issue.rank.is_(None), Issue.deleted_at.is_(None))
+        .distinct()
+    )
+    for project_id, status in result.all():
+        await rebalance_column(db, project_id, status)
+
+
+def needs_rebalance(rank: str) -> bool:
+    """Whether a freshly computed rank is long enough to warrant a rebalance"""
+    return len(rank) > REBALANCE_LENGTH
+
+
+async def rebalance_column_in_background(project_id: int, status: str):
+    """Background task wrapper for rebalance_column with its own session"""
+    async with AsyncSessionLocal() as session:
+        await rebalance_column(session, project_id, status)
@@ -0,0 +1,200 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Full-text index over issue titles, descriptions and comments.
+# SQLite uses an FTS5 virtual table keyed by the issue id (rowid); Postgres
+# uses a regular table with a generated, weighted tsvector and a GIN index.
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# FTS5 operator words. Queries are plain AND-of-words, so these are dropped
+# rather than becoming words every result would have to contain.
+FTS5_OPERATORS = {"and", "or", "not", "near"}
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS issue_search USING fts5(
+        title, description, comments,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS issue_search (
+        issue_id INTEGER PRIMARY KEY REFERENCES issues(id),
+        title TEXT NOT NULL DEFAULT '',
+        description TEXT NOT NULL DEFAULT '',
+        comments TEXT NOT NULL DEFAULT '',
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A') ||
+            setweight(to_tsvector('english', description), 'B') ||
+            setweight(to_tsvector('english', comments), 'C')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_issue_search_document ON issue_search USING GIN (document)",
+]
+
+# Issue row (if not deleted) with all live comments concatenated
+_DOCUMENT_SQL = """
+    SELECT i.id, i.title, COALESCE(i.description, ''),
+           COALESCE((SELECT {aggregate} FROM comments c
+                     WHERE c.issue_id = i.id AND c.deleted_at IS NULL), '')
+    FROM issues i
+    WHERE i.deleted_at IS NULL {filter}
+"""
+
+SQLITE_SEARCH_SQL = """
+    SELECT i.id, i.project_id, i.title, i.status,
+           highlight(issue_search, 0, :hl_start, :hl_end) AS title_highlight,
+           snippet(issue_search, -1, :hl_start, :hl_end, '...', 24) AS snippet,
+           -bm25(issue_search, 10.0, 4.0, 1.0) AS rank
+    FROM issue_search
+    JOIN issues i ON i.id = issue_search.rowid
+    JOIN projects p ON p.id = i.project_id
+    JOIN team_members tm ON tm.team_id = p.team_id AND tm.user_id = :user_id
+    WHERE issue_search MATCH :query
+      AND i.deleted_at IS NULL
+      AND p.deleted_at IS NULL
+      {project_filter}
+    ORDER BY rank DESC
+    LIMIT :limit
+"""
+
+POSTGRES_SEARCH_SQL = """
+    SELECT i.id, i.project_id, i.title, i.status,
+           ts_headline('english', s.title, q,
+                       'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', HighlightAll=true') AS title_highlight,
+           ts_headline('english', s.description || ' ' || s.comments, q,
+                       'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxFragments=2') AS snippet,
+           ts_rank_cd(s.document, q) AS rank
+    FROM issue_search s
+    CROSS JOIN websearch_to_tsquery('english', :query) q
+    JOIN issues i ON i.id = s.issue_id
+    JOIN projects p ON p.id = i.project_id
+    JOIN team_members tm ON tm.team_id = p.team_id AND tm.user_id = :user_id
+    WHERE s.document @@ q
+      AND i.deleted_at IS NULL
+      AND p.deleted_at IS NULL
+      {project_filter}
+    ORDER BY rank DESC
+    LIMIT :limit
+"""
+
+
+def _is_postgres(dialect_name: str) -> bool:
+    return dialect_name == "postgresql"
+
+
+def _insert_sql(dialect_name: str, issue_filter: str = "") -> str:
+    aggregate = "string_agg(c.content, ' ')" if _is_postgres(dialect_name) else "group_concat(c.content, ' ')"
+    columns = "issue_id, title, description, comments" if _is_postgres(dialect_name) else "rowid, title, description, comments"
+    document_sql = _DOCUMENT_SQL.format(aggregate=aggregate, filter=issue_filter)
+    return f"INSERT INTO issue_search ({columns}) {document_sql}"
+
+
+def _key_column(dialect_name: str) -> str:
+    return "issue_id" if _is_postgres(dialect_name) else "rowid"
+
+
+def create_search_index(connection):
+    """Create the search index if needed and backfill it when empty (sync, for run_sync)"""
+    dialect_name = connection.dialect.name
+    ddl = POSTGRES_DDL if _is_postgres(dialect_name) else SQLITE_DDL
+    for statement in ddl:
+        connection.execute(text(statement))
+
+    indexed = connection.execute(text("SELECT COUNT(*) FROM issue_search")).scalar()
+    if not indexed:
+        connection.execute(text(_insert_sql(dialect_name)))
+
+
+async def reindex_issue(db: AsyncSession, issue_id: int):
+    """Refresh the search entry of one issue inside the current transaction
+
+    Call after any write to the issue's title/description, its comments, or
+    its deletion. Deleted issues are simply dropped from the index.
+    """
+    dialect_name = db.bind.dialect.name
+    await db.execute(
+        text(f"DELETE FROM issue_search WHERE {_key_column(dialect_name)} = :issue_id"),
+        {"issue_id": issue_id}
+    )
+    await db.execute(text(_insert_sql(dialect_name, "AND i.id = :issue_id")), {"issue_id": issue_id})
+
+
+async def reindex_issues(db: AsyncSession, issue_ids: List[int]):
+    """Batch version of reindex_issue (e.g. after an import)"""
+    if not issue_ids:
+        return
+    await remove_from_index(db, issue_ids)
+    dialect_name = db.bind.dialect.name
+    await db.execute(
+        text(_insert_sql(dialect_name, "AND i.id IN :issue_ids"))
+        .bindparams(bindparam("issue_ids", expanding=True)),
+        {"issue_ids": list(issue_ids)}
+    )
+
+
+async def remove_from_index(db: AsyncSession, issue_ids: List[int]):
+    """Drop several issues from the search index (e.g. after a bulk delete)"""
+    if not issue_ids:
+        return
+    dialect_name = db.bind.dialect.name
+    await db.execute(
+        text(f"DELETE FROM issue_search WHERE {_key_column(dialect_name)} IN :issue_ids")
+        .bindparams(bindparam("issue_ids", expanding=True)),
+        {"issue_ids": list(issue_ids)}
+    )
+
+
+def build_fts5_query(raw_query: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix
+
+    Operator words (AND, OR, NOT, NEAR, any case) are ignored.
+    """
+    words = [word for word in re.findall(r"\w+", raw_query) if word.lower() not in FTS5_OPERATORS]
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+async def search_issues(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    project_id: Optional[int] = None,
+    limit: int = 20
+) -> List[dict]:
+    """Ranked, highlighted search restricted to projects of the user's teams"""
+    dialect_name = db.bind.dialect.name
+
+    if _is_postgres(dialect_name):
+        sql = POSTGRES_SEARCH_SQL
+        match_query = query
+    else:
+        sql = SQLITE_SEARCH_SQL
+        match_query = build_fts5_query(query)
+        if match_query is None:
+            return []
+
+    params = {
+        "query": match_query,
+        "user_id": user_id,
+        "limit": limit,
+        "hl_start": HIGHLIGHT_START,
+        "hl_end": HIGHLIGHT_END,
+    }
+    project_filter = ""
+    if project_id:
+        project_filter = "AND i.project_id = :project_id"
+        params["project_id"] = project_id
+
+    result = await db.execute(text(sql.format(project_filter=project_filter)), params)
+    return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+# Fast path for list responses: rows are shaped once (plain dicts for rows we
+# build ourselves from the database, or schemas validated in bulk) and the
+# endpoint returns a FastJSONResponse, which skips FastAPI's second
+# validate + jsonable_encoder pass and encodes with orjson.
+
+_list_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def _default(value: Any) -> Any:
+    # orjson handles dicts, lists, datetimes, dates and enums itself
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (pydantic models are dumped as-is)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def validate_many(schema: Type[BaseModel], rows: Sequence[Any]) -> List[BaseModel]:
+    """Validate ORM rows into schemas with a single TypeAdapter call"""
+    adapter = _list_adapters.get(schema)
+    if adapter is None:
+        adapter = _list_adapters[schema] = TypeAdapter(List[schema])
+    return adapter.validate_python(rows, from_attributes=True)
+
+
+def fast_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """Return `content` as a FastJSONResponse, keeping headers already set on `response`
+
+    Returned responses bypass the endpoint's response_model: only pass
+    content that already has the response shape.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content=content, headers=headers)
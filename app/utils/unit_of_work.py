@@ -0,0 +1,37 @@
+from collections import defaultdict
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Side-effect rows (notifications, activity logs, issue history) are collected
+# on the request's session and written when it commits: one multi-row INSERT
+# per table, in the same transaction as the change that caused them. So a
+# request commits once, and a failed request leaves no side effects behind.
+
+PENDING_ROWS_KEY = "pending_rows"
+
+
+def add_row(db: AsyncSession, model, **values):
+    """Queue a row of `model` to be inserted when the session commits
+
+    Rows of one model are inserted together, so they should set the same
+    columns.
+    """
+    db.info.setdefault(PENDING_ROWS_KEY, defaultdict(list))[model].append(values)
+
+
+@event.listens_for(Session, "before_commit")
+def _insert_pending_rows(session: Session):
+    pending = session.info.pop(PENDING_ROWS_KEY, None)
+    if not pending:
+        return
+    # Runs before the commit's final flush; executing autoflushes pending
+    # objects first, so the rows can reference them
+    for model, rows in pending.items():
+        session.execute(insert(model), rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_rows(session: Session):
+    session.info.pop(PENDING_ROWS_KEY, None)
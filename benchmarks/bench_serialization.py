@@ -0,0 +1,152 @@
+"""Microbenchmark: cost of turning 1,000 issue rows into a JSON response body
+
+    python benchmarks/bench_serialization.py [--issues 1000] [--repeat 20]
+
+"before" is the previous path: one validated IssueResponse (plus from_orm for
+every label and subtask) per row, then FastAPI's response_model handling,
+i.e. dump, validate again, serialize to JSON-compatible data, json.dumps.
+"after" is the current path: build_issue_responses (plain dicts) and a
+FastJSONResponse (orjson). Related rows are served from a pre-filled
+RequestLoader, so no database is involved.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.user import User
+from app.models.issue import Issue, IssuePriority, IssueLabel, Subtask
+from app.schemas.issue import IssueResponse, IssueLabelResponse, SubtaskResponse
+from app.utils.loaders import LOADER_KEY, RequestLoader, build_issue_responses
+from app.utils.serialization import FastJSONResponse
+
+
+class FakeSession:
+    """Just enough of a session for get_loader"""
+
+    def __init__(self):
+        self.info = {}
+
+
+def make_rows(count: int):
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    users = {user_id: User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com") for user_id in range(1, 11)}
+    labels = [IssueLabel(id=label_id, project_id=1, name=f"label-{label_id}", color="#ff0000") for label_id in range(1, 6)]
+
+    issues, issue_labels, issue_subtasks = [], {}, {}
+    for issue_id in range(1, count + 1):
+        issues.append(Issue(
+            id=issue_id,
+            title=f"Issue {issue_id}",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            project_id=1,
+            creator_id=1 + issue_id % 10,
+            assignee_id=1 + (issue_id * 7) % 10,
+            status="IN_PROGRESS",
+            priority=IssuePriority.MEDIUM,
+            due_date=date(2024, 2, 1),
+            position=issue_id,
+            rank=f"i{issue_id:05d}",
+            created_at=now + timedelta(seconds=issue_id),
+            updated_at=now + timedelta(seconds=issue_id)
+        ))
+        issue_labels[issue_id] = labels[: issue_id % 3]
+        issue_subtasks[issue_id] = [
+            Subtask(id=issue_id * 10 + index, issue_id=issue_id, title=f"Step {index}", is_completed=False, position=index, created_at=now)
+            for index in range(issue_id % 4)
+        ]
+
+    return issues, users, issue_labels, issue_subtasks
+
+
+def before(issues, users, issue_labels, issue_subtasks, adapter: TypeAdapter) -> bytes:
+    responses = []
+    for issue in issues:
+        assignee = users.get(issue.assignee_id)
+        creator = users.get(issue.creator_id)
+        responses.append(IssueResponse(
+            id=issue.id,
+            title=issue.title,
+            description=issue.description,
+            project_id=issue.project_id,
+            creator_id=issue.creator_id,
+            assignee_id=issue.assignee_id,
+            status=issue.status,
+            priority=issue.priority,
+            due_date=issue.due_date,
+            position=issue.position,
+            rank=issue.rank,
+            created_at=issue.created_at,
+            updated_at=issue.updated_at,
+            labels=[IssueLabelResponse.from_orm(label) for label in issue_labels[issue.id]],
+            subtasks=[SubtaskResponse.from_orm(subtask) for subtask in issue_subtasks[issue.id]],
+            assignee_name=assignee.name if assignee else None,
+            creator_name=creator.name if creator else None
+        ))
+
+    # What FastAPI does with a response_model: dump, validate, serialize, encode
+    content = adapter.dump_python(adapter.validate_python([response.model_dump() for response in responses]), mode="json")
+    return JSONResponse(content).body
+
+
+async def after(issues, users, issue_labels, issue_subtasks) -> bytes:
+    db = FakeSession()
+    loader = RequestLoader(db)
+    loader._users.update(users)
+    loader._labels.update(issue_labels)
+    loader._subtasks.update(issue_subtasks)
+    db.info[LOADER_KEY] = loader
+
+    return FastJSONResponse(await build_issue_responses(db, issues)).body
+
+
+def measure(function, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.issues)
+    adapter = TypeAdapter(List[IssueResponse])
+    loop = asyncio.new_event_loop()
+
+    def run_after():
+        return loop.run_until_complete(after(*rows))
+
+    # Same output, modulo whitespace
+    assert json.loads(before(*rows, adapter)) == json.loads(run_after()), "paths disagree"
+
+    per_thousand = 1000 / args.issues
+    results = {}
+    for name, function in (("before", lambda: before(*rows, adapter)), ("after", run_after)):
+        function()  # Warm up
+        results[name] = median(measure(function, args.repeat)) * 1000 * per_thousand
+
+    print(f"{args.issues} issues, median of {args.repeat} runs, ms per 1,000 issues")
+    print(f"  before (validated models + response_model + json): {results['before']:8.2f} ms")
+    print(f"  after  (dict rows + orjson):                        {results['after']:8.2f} ms")
+    print(f"  speedup: {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
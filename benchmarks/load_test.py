@@ -0,0 +1,313 @@
+"""Load test: drive the real app in-process with a realistic request mix
+
+    python benchmarks/load_test.py [--teams 4] [--issues-per-project 60]
+                                   [--requests 3000] [--concurrency 20]
+                                   [--save-baseline benchmarks/baseline.json]
+                                   [--compare benchmarks/baseline.json]
+
+A fresh SQLite database is seeded with --teams teams of --users-per-team
+members, each team with --projects-per-team projects of
+--issues-per-project issues. Then --concurrency virtual users send
+--requests requests to main.app through httpx.ASGITransport (no network, no
+server process): board loads, issue details, comments, notification polling
+and status drags, weighted like a typical session (see MIX).
+
+Reports throughput and p50/p95/p99 latency per endpoint. --save-baseline
+writes the results as JSON; --compare prints the change against such a file
+and exits with status 1 when a p95 or the throughput regressed by more than
+--threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from statistics import mean
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Request mix: (endpoint name, weight)
+MIX = [
+    ("board", 20),
+    ("issue_detail", 30),
+    ("notifications_poll", 25),
+    ("post_comment", 10),
+    ("status_drag", 15),
+]
+
+STATUSES = ["BACKLOG", "IN_PROGRESS", "REVIEW", "DONE"]
+
+
+def configure_environment(database_path: str):
+    """Settings are read at import time, so this must run before importing the app"""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database_path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["PURGE_ENABLED"] = "false"
+    os.environ.setdefault("SLOW_QUERY_MS", "5000")
+
+
+async def seed(args) -> dict:
+    """Insert the dataset directly (faster than the API) and mint a token per user"""
+    from app.core.database import engine, Base, AsyncSessionLocal
+    from app.core.security import create_access_token, get_password_hash
+    from app.models import User, Team, TeamMember, Project, Issue
+    from app.models.team import TeamRole
+    from app.models.issue import IssuePriority
+    from app.utils.quota import LIMITS, PROJECT_ISSUES
+
+    issues_per_project = min(args.issues_per_project, LIMITS[PROJECT_ISSUES])
+    rng = random.Random(args.seed)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    hashed_password = get_password_hash("benchmark")
+    teams = []
+    async with AsyncSessionLocal() as session:
+        for team_index in range(args.teams):
+            users = [
+                User(email=f"user{team_index}-{index}@bench.test", name=f"User {team_index}-{index}", hashed_password=hashed_password)
+                for index in range(args.users_per_team)
+            ]
+            session.add_all(users)
+            await session.flush()
+
+            team = Team(name=f"Team {team_index}", owner_id=users[0].id)
+            session.add(team)
+            await session.flush()
+            session.add_all([
+                TeamMember(team_id=team.id, user_id=user.id, role=TeamRole.OWNER if index == 0 else TeamRole.MEMBER)
+                for index, user in enumerate(users)
+            ])
+
+            projects = []
+            for project_index in range(args.projects_per_team):
+                project = Project(name=f"Project {team_index}-{project_index}", team_id=team.id, owner_id=users[0].id)
+                session.add(project)
+                await session.flush()
+
+                issues = [
+                    Issue(
+                        title=f"Issue {issue_index} of project {project.id}",
+                        description="Steps to reproduce, expected and actual behaviour. " * 4,
+                        project_id=project.id,
+                        creator_id=rng.choice(users).id,
+                        assignee_id=rng.choice(users).id,
+                        status=rng.choice(STATUSES),
+                        priority=rng.choice(list(IssuePriority)),
+                        position=issue_index
+                    )
+                    for issue_index in range(issues_per_project)
+                ]
+                session.add_all(issues)
+                await session.flush()
+                projects.append({"id": project.id, "issue_ids": [issue.id for issue in issues]})
+
+            teams.append({
+                "tokens": [create_access_token({"sub": str(user.id)}) for user in users],
+                "projects": projects,
+            })
+        await session.commit()
+
+    return {"teams": teams}
+
+
+def build_request(name: str, rng: random.Random, dataset: dict):
+    """(method, url, token, json body) for one request of the mix"""
+    team = rng.choice(dataset["teams"])
+    token = rng.choice(team["tokens"])
+    project = rng.choice(team["projects"])
+    issue_id = rng.choice(project["issue_ids"])
+
+    if name == "board":
+        return "GET", f"/api/projects/{project['id']}/board", token, None
+    if name == "issue_detail":
+        return "GET", f"/api/issues/{issue_id}", token, None
+    if name == "notifications_poll":
+        return "GET", "/api/notifications/unread-count", token, None
+    if name == "post_comment":
+        return "POST", "/api/comments", token, {"issue_id": issue_id, "content": "Looks good, merging after review."}
+    if name == "status_drag":
+        return "PATCH", f"/api/issues/{issue_id}/status", token, {"status": rng.choice(STATUSES)}
+    raise ValueError(name)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_load(args, dataset: dict) -> dict:
+    import httpx
+    import main
+
+    names = [name for name, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+            async def send(name: str, rng: random.Random, record: bool):
+                method, url, token, body = build_request(name, rng, dataset)
+                started = time.perf_counter()
+                response = await client.request(method, url, json=body, headers={"Authorization": f"Bearer {token}"})
+                elapsed = time.perf_counter() - started
+                if record:
+                    latencies[name].append(elapsed)
+                    if response.status_code >= 400:
+                        errors[name] += 1
+
+            async def virtual_user(user_index: int, count: int, record: bool):
+                rng = random.Random(args.seed * 1000 + user_index + (0 if record else 10 ** 6))
+                for _ in range(count):
+                    await send(rng.choices(names, weights)[0], rng, record)
+
+            def split(total: int) -> List[int]:
+                return [total // args.concurrency + (1 if index < total % args.concurrency else 0) for index in range(args.concurrency)]
+
+            # Warm up caches and connections; not recorded
+            await asyncio.gather(*[virtual_user(index, count, False) for index, count in enumerate(split(args.warmup))])
+
+            started = time.perf_counter()
+            await asyncio.gather(*[virtual_user(index, count, True) for index, count in enumerate(split(args.requests))])
+            elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        values = sorted(latencies[name])
+        if not values:
+            continue
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "throughput_rps": round(len(values) / elapsed, 1),
+            "mean_ms": round(mean(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        }
+
+    everything = sorted(value for values in latencies.values() for value in values)
+    return {
+        "endpoints": endpoints,
+        "total": {
+            "requests": len(everything),
+            "errors": sum(errors.values()),
+            "elapsed_s": round(elapsed, 2),
+            "throughput_rps": round(len(everything) / elapsed, 1),
+            "p50_ms": round(percentile(everything, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(everything, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(everything, 0.99) * 1000, 2),
+        },
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: dict):
+    header = f"{'endpoint':<20}{'requests':>9}{'errors':>8}{'req/s':>9}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(results["endpoints"].items()) + [("TOTAL", {**results["total"], "mean_ms": None})]
+    for name, stats in rows:
+        mean_ms = f"{stats['mean_ms']:>10.2f}" if stats["mean_ms"] is not None else f"{'':>10}"
+        print(
+            f"{name:<20}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput_rps']:>9.1f}"
+            f"{mean_ms}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+        )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print the change against a baseline; True when something regressed beyond `threshold` %"""
+    def change(current: float, previous: float) -> float:
+        return (current - previous) / previous * 100 if previous else 0.0
+
+    print(f"\nCompared with baseline {baseline.get('revision') or '?'} ({baseline.get('created_at', '?')}):")
+    regressed = False
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    previous_rows = {**baseline["results"]["endpoints"], "TOTAL": baseline["results"]["total"]}
+    for name, stats in rows:
+        previous = previous_rows.get(name)
+        if previous is None:
+            continue
+        p95_change = change(stats["p95_ms"], previous["p95_ms"])
+        rps_change = change(stats["throughput_rps"], previous["throughput_rps"])
+        flag = ""
+        if p95_change > threshold or -rps_change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {name:<20} p95 {previous['p95_ms']:>8.2f} -> {stats['p95_ms']:>8.2f} ms ({p95_change:+6.1f}%)"
+              f"   req/s {previous['throughput_rps']:>8.1f} -> {stats['throughput_rps']:>8.1f} ({rps_change:+6.1f}%){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=4)
+    parser.add_argument("--users-per-team", type=int, default=8)
+    parser.add_argument("--projects-per-team", type=int, default=3)
+    parser.add_argument("--issues-per-project", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=20.0, help="regression threshold in percent (default 20)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "benchmark.db"))
+
+        async def run():
+            dataset = await seed(args)
+            return await run_load(args, dataset)
+
+        results = asyncio.run(run())
+
+    config = {key: value for key, value in vars(args).items() if key not in ("save_baseline", "compare", "threshold")}
+    print(f"{args.requests} requests, {args.concurrency} concurrent, "
+          f"{args.teams} teams x {args.projects_per_team} projects x {args.issues_per_project} issues\n")
+    print_report(results)
+
+    regressed = False
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get("config") != config:
+            print("\nNote: the baseline was recorded with different options:", baseline.get("config"))
+        regressed = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump({
+                "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                "revision": git_revision(),
+                "python": sys.version.split()[0],
+                "config": config,
+                "results": results,
+            }, file, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
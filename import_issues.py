@@ -0,0 +1,54 @@
+"""
+Import issues into a project from a CSV or NDJSON file.
+Run with: python import_issues.py --project-id 1 --user-email demo@example.com issues.csv
+
+CSV columns / NDJSON keys: title, description, status, priority,
+assignee_email, due_date, labels, subtasks (lists as "a;b;c" in CSV).
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.project import Project
+from app.utils.importer import IMPORT_FORMATS, import_issues
+
+
+async def main(args):
+    file_format = args.format or args.file.rsplit(".", 1)[-1].lower()
+    if file_format == "jsonl":
+        file_format = "ndjson"
+    if file_format not in IMPORT_FORMATS:
+        sys.exit("Unsupported import format, use --format csv or --format ndjson")
+
+    async with AsyncSessionLocal() as session:
+        user_result = await session.execute(
+            select(User).where(User.email == args.user_email, User.deleted_at.is_(None))
+        )
+        user = user_result.scalar_one_or_none()
+        project_result = await session.execute(
+            select(Project).where(Project.id == args.project_id, Project.deleted_at.is_(None))
+        )
+        project = project_result.scalar_one_or_none()
+
+        if not user or not project:
+            sys.exit("User or project not found")
+
+        with open(args.file, "rb") as stream:
+            report = await import_issues(session, project, user.id, stream, file_format)
+
+    print(f"✓ Imported {report.imported} issues, {report.failed} failed")
+    for error in report.errors:
+        print(f"  line {error.row}: {error.error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import issues into a project")
+    parser.add_argument("file", help="CSV or NDJSON file")
+    parser.add_argument("--project-id", type=int, required=True)
+    parser.add_argument("--user-email", required=True, help="Creator of the imported issues")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    asyncio.run(main(parser.parse_args()))
@@ -1,19 +1,28 @@
+import asyncio
 import os
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 
-from app.core.database import engine, Base
+from app.core.database import engine, read_engine, Base, AsyncSessionLocal, add_missing_columns, create_missing_indexes
 from app.core.config import settings
-from app.routes import auth, teams, projects, issues, comments, notifications
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.pool import pool_metric_lines
+from app.core.security import verify_metrics_access
+from app.utils.search import create_search_index
+from app.utils.ranking import rebalance_unranked_columns
+from app.utils.purge import purge_periodically
+from app.utils.serialization import FastJSONResponse
+from app.routes import auth, teams, projects, issues, comments, notifications, diagnostics
 
 # Import all models to ensure they're registered with SQLAlchemy
 from app.models import (
     User, Team, TeamMember, Project, ProjectStatus, ProjectFavorite,
     Issue, IssueLabel, IssueLabelAssignment, Subtask, IssueHistory,
-    Comment, Notification, ActivityLog, TeamInvite
+    Comment, Notification, ActivityLog, TeamInvite, QuotaCounter, ArchivedRow
 )
 
 
@@ -23,11 +32,27 @@ async def lifespan(app: FastAPI):
     # Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(create_search_index)
+
+    # Give issues created before rank ordering existed a rank
+    async with AsyncSessionLocal() as session:
+        await rebalance_unranked_columns(session)
+
+    # Archive rows soft-deleted long ago, in the background
+    stop_purge = asyncio.Event()
+    purge_task = asyncio.create_task(purge_periodically(stop_purge)) if settings.PURGE_ENABLED else None
 
     yield
 
     # Cleanup (if needed)
+    if purge_task is not None:
+        stop_purge.set()
+        await purge_task
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 # Create FastAPI app
@@ -35,7 +60,8 @@ app = FastAPI(
     title=settings.APP_NAME,
     description="AI-Powered Issue Tracking API (Jira Lite MVP)",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -45,8 +71,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
 
+# Request metrics per route template (inside QueryStatsMiddleware, which it reads)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Per-request database time and statement count (Server-Timing header)
+app.add_middleware(QueryStatsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(teams.router, prefix="/api")
@@ -54,6 +88,7 @@ app.include_router(projects.router, prefix="/api")
 app.include_router(issues.router, prefix="/api")
 app.include_router(comments.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api")
+app.include_router(diagnostics.router, prefix="/api")
 
 # Serve static files from frontend build (if exists)
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -67,6 +102,19 @@ async def health_check():
     return {"status": "healthy"}
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_access)])
+    async def metrics():
+        """Prometheus metrics (METRICS_TOKEN bearer token, or loopback clients only)"""
+        pools = {"primary": engine.pool}
+        if read_engine is not None:
+            pools["read"] = read_engine.pool
+        return PlainTextResponse(
+            render_metrics(pool_metric_lines(pools)),
+            media_type="text/plain; version=0.0.4"
+        )
+
+
 @app.get("/api")
 async def api_root():
     """API root endpoint"""
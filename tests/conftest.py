@@ -0,0 +1,88 @@
+"""Test setup: a throwaway SQLite database and an in-process client
+
+    pip install pytest && python -m pytest
+
+Async tests run with the anyio plugin (anyio comes with httpx). Settings are
+read when the app is imported, so the environment is set here, before any
+test module imports it.
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+_directory = tempfile.mkdtemp(prefix="jira-lite-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PURGE_ENABLED"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+
+import main
+from app.core.database import AsyncSessionLocal
+from app.models.team import TeamMember, TeamRole
+
+_emails = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """HTTP client for main.app, with the lifespan (tables, indexes) run once around the session
+
+    Being session-scoped also keeps one event loop for the whole run, like a
+    server process (the engine's SQLite write lock belongs to its loop).
+    """
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+            yield http_client
+
+
+@pytest.fixture
+async def db(client):
+    """Session on the test database (tables are created by the client's lifespan)"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def signup(client: httpx.AsyncClient, name: str = "User") -> dict:
+    """Create a user and return its id and Authorization headers"""
+    email = f"user{next(_emails)}@test.example"
+    response = await client.post("/api/auth/signup", json={"email": email, "name": name, "password": "secret1"})
+    assert response.status_code == 201, response.text
+    user_id = response.json()["id"]
+
+    response = await client.post("/api/auth/login", json={"email": email, "password": "secret1"})
+    assert response.status_code == 200, response.text
+    return {"id": user_id, "headers": {"Authorization": f"Bearer {response.json()['access_token']}"}}
+
+
+async def create_project(client: httpx.AsyncClient, owner: dict, *members: dict) -> int:
+    """Create a team owned by `owner`, add `members` to it and return a new project's id"""
+    response = await client.post("/api/teams", json={"name": "Team"}, headers=owner["headers"])
+    assert response.status_code == 201, response.text
+    team_id = response.json()["id"]
+
+    if members:
+        await add_members(team_id, *members)
+
+    response = await client.post("/api/projects", json={"name": "Project", "team_id": team_id}, headers=owner["headers"])
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def add_members(team_id: int, *members: dict):
+    """Add team members directly (the invite flow needs email)"""
+    async with AsyncSessionLocal() as session:
+        session.add_all([TeamMember(team_id=team_id, user_id=member["id"], role=TeamRole.MEMBER) for member in members])
+        await session.commit()
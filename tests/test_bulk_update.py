@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.models.issue import Issue, IssueHistory
+from conftest import signup, create_project
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_issues(client, user: dict, project_id: int, count: int) -> list:
+    issue_ids = []
+    for index in range(count):
+        response = await client.post("/api/issues", json={"title": f"Issue {index}", "project_id": project_id}, headers=user["headers"])
+        assert response.status_code == 201, response.text
+        issue_ids.append(response.json()["id"])
+    return issue_ids
+
+
+async def test_priority_change_from_null(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    issue_ids = await create_issues(client, owner, project_id, 2)
+    await db.execute(update(Issue).where(Issue.id == issue_ids[0]).values(priority=None))
+    await db.commit()
+
+    response = await client.post("/api/issues/bulk", json={"issue_ids": issue_ids, "priority": "HIGH"}, headers=owner["headers"])
+    assert response.status_code == 200, response.text
+
+    result = await db.execute(
+        select(IssueHistory.issue_id, IssueHistory.old_value, IssueHistory.new_value)
+        .where(IssueHistory.issue_id.in_(issue_ids), IssueHistory.field_name == "priority")
+        .order_by(IssueHistory.issue_id)
+    )
+    assert result.all() == [(issue_ids[0], None, "HIGH"), (issue_ids[1], "MEDIUM", "HIGH")]
+
+
+async def test_assignee_must_be_team_member(client, db):
+    owner = await signup(client)
+    member = await signup(client)
+    outsider = await signup(client)
+    project_id = await create_project(client, owner, member)
+    issue_ids = await create_issues(client, owner, project_id, 2)
+
+    response = await client.post("/api/issues/bulk", json={"issue_ids": issue_ids, "assignee_id": outsider["id"]}, headers=owner["headers"])
+    assert response.status_code == 400
+    result = await db.execute(select(Issue.assignee_id).where(Issue.id.in_(issue_ids)))
+    assert set(result.scalars().all()) == {None}
+
+    response = await client.post("/api/issues/bulk", json={"issue_ids": issue_ids, "assignee_id": member["id"]}, headers=owner["headers"])
+    assert response.status_code == 200, response.text
+    result = await db.execute(select(Issue.assignee_id).where(Issue.id.in_(issue_ids)))
+    assert set(result.scalars().all()) == {member["id"]}
+
+
+async def test_assignee_must_be_member_of_every_project_team(client):
+    owner = await signup(client)
+    member = await signup(client)
+    first_project_id = await create_project(client, owner, member)
+    second_project_id = await create_project(client, owner)
+    issue_ids = await create_issues(client, owner, first_project_id, 1) + await create_issues(client, owner, second_project_id, 1)
+
+    response = await client.post("/api/issues/bulk", json={"issue_ids": issue_ids, "assignee_id": member["id"]}, headers=owner["headers"])
+    assert response.status_code == 400
+
+
+async def test_moved_cards_follow_request_order(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    issue_ids = await create_issues(client, owner, project_id, 4)
+    requested = [issue_ids[2], issue_ids[0], issue_ids[3], issue_ids[1]]
+
+    response = await client.post("/api/issues/bulk", json={"issue_ids": requested, "status": "DONE"}, headers=owner["headers"])
+    assert response.status_code == 200, response.text
+
+    result = await db.execute(
+        select(Issue.id).where(Issue.project_id == project_id, Issue.status == "DONE").order_by(Issue.rank)
+    )
+    assert result.scalars().all() == requested
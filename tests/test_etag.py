@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import update
+
+from app.models.issue import IssueLabel
+from conftest import signup, create_project
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_issue(client, user: dict, project_id: int, **fields) -> dict:
+    response = await client.post("/api/issues", json={"title": "Crash on save", "project_id": project_id, **fields}, headers=user["headers"])
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def get_with_etag(client, user: dict, url: str, etag: str = None):
+    headers = dict(user["headers"])
+    if etag:
+        headers["If-None-Match"] = etag
+    return await client.get(url, headers=headers)
+
+
+async def test_unchanged_issue_is_not_modified(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    issue = await create_issue(client, owner, project_id)
+
+    for url in (f"/api/issues/{issue['id']}", f"/api/issues?project_id={project_id}"):
+        response = await get_with_etag(client, owner, url)
+        assert response.status_code == 200
+        response = await get_with_etag(client, owner, url, response.headers["ETag"])
+        assert response.status_code == 304
+
+
+async def test_renaming_creator_or_assignee_changes_etag(client):
+    owner = await signup(client, "Alice")
+    assignee = await signup(client, "Bob")
+    project_id = await create_project(client, owner, assignee)
+    issue = await create_issue(client, owner, project_id, assignee_id=assignee["id"])
+
+    urls = (f"/api/issues/{issue['id']}", f"/api/issues?project_id={project_id}")
+    etags = {url: (await get_with_etag(client, owner, url)).headers["ETag"] for url in urls}
+
+    response = await client.put("/api/auth/me", json={"name": "Alicia"}, headers=owner["headers"])
+    assert response.status_code == 200, response.text
+
+    for url in urls:
+        response = await get_with_etag(client, owner, url, etags[url])
+        assert response.status_code == 200
+        body = response.json()
+        assert (body if isinstance(body, dict) else body[0])["creator_name"] == "Alicia"
+        etags[url] = response.headers["ETag"]
+
+    response = await client.put("/api/auth/me", json={"name": "Robert"}, headers=assignee["headers"])
+    assert response.status_code == 200, response.text
+
+    for url in urls:
+        response = await get_with_etag(client, owner, url, etags[url])
+        assert response.status_code == 200
+        body = response.json()
+        assert (body if isinstance(body, dict) else body[0])["assignee_name"] == "Robert"
+
+
+async def test_renaming_label_changes_etag(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    label = IssueLabel(project_id=project_id, name="bug", color="#ff0000")
+    db.add(label)
+    await db.commit()
+    issue = await create_issue(client, owner, project_id, label_ids=[label.id])
+
+    urls = (f"/api/issues/{issue['id']}", f"/api/issues?project_id={project_id}")
+    etags = {url: (await get_with_etag(client, owner, url)).headers["ETag"] for url in urls}
+
+    await db.execute(update(IssueLabel).where(IssueLabel.id == label.id).values(name="defect", color="#00ff00"))
+    await db.commit()
+
+    for url in urls:
+        response = await get_with_etag(client, owner, url, etags[url])
+        assert response.status_code == 200
+        body = response.json()
+        labels = (body if isinstance(body, dict) else body[0])["labels"]
+        assert [(label["name"], label["color"]) for label in labels] == [("defect", "#00ff00")]
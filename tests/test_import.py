@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import signup, create_project
+
+pytestmark = pytest.mark.anyio
+
+
+async def upload(client, user: dict, project_id: int, filename: str, content: bytes):
+    response = await client.post(
+        f"/api/projects/{project_id}/issues/import",
+        files={"file": (filename, content)},
+        headers=user["headers"]
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_import_csv_and_ndjson(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    report = await upload(client, owner, project_id, "issues.csv", "﻿title,priority\nFirst,high\n,low\n".encode())
+    assert report["imported"] == 1
+    assert [error["row"] for error in report["errors"]] == [3]
+
+    report = await upload(client, owner, project_id, "issues.ndjson", b'{"title": "First"}\n\n[1]\nnot json\n{"title": "Last"}\n')
+    assert report["imported"] == 2
+    assert [(error["row"], error["error"]) for error in report["errors"]] == [(3, "Invalid JSON object"), (4, "Invalid JSON object")]
+
+
+async def test_ndjson_line_that_is_not_utf8_is_rejected_alone(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    content = b'{"title": "First"}\n{"title": "Bad \xff"}\n{"title": "Last"}\n'
+    report = await upload(client, owner, project_id, "issues.ndjson", content)
+
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert [(error["row"], error["error"]) for error in report["errors"]] == [(2, "Not valid UTF-8")]
+
+
+async def test_csv_that_is_not_utf8_reports_where_reading_stopped(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    content = b"title\nFirst\nSecond\nBad \xff\nLast\n"
+    report = await upload(client, owner, project_id, "issues.csv", content)
+
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    [error] = report["errors"]
+    assert error["row"] == 4
+    assert error["error"].startswith("Not valid UTF-8")
+
+    response = await client.get(f"/api/issues?project_id={project_id}", headers=owner["headers"])
+    assert sorted(issue["title"] for issue in response.json()) == ["First", "Second"]
+
+
+async def test_malformed_csv_is_reported(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    # Longer than csv.field_size_limit()
+    content = b"title\nFirst\n" + b"x" * 200000 + b"\nLast\n"
+    report = await upload(client, owner, project_id, "issues.csv", content)
+
+    assert report["imported"] == 1
+    [error] = report["errors"]
+    assert error["row"] == 3
+    assert "Malformed CSV" in error["error"]
@@ -0,0 +1,37 @@
+import httpx
+import pytest
+
+import main
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def remote_client() -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=main.app, client=("203.0.113.5", 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_metrics_served_to_loopback_clients_without_token(client):
+    await client.get("/health")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+
+    async with remote_client() as remote:
+        response = await remote.get("/metrics")
+    assert response.status_code == 403
+
+
+async def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    async with remote_client() as remote:
+        assert (await remote.get("/metrics")).status_code == 401
+        response = await remote.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == 401
+        response = await remote.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+
+    # With a token set, loopback clients need it too
+    assert (await client.get("/metrics")).status_code == 401
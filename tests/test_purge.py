@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, func
+
+from app.models.archive import ArchivedRow
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.utils.purge import purge_soft_deleted
+from conftest import signup, create_project
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_purge_archives_old_rows_and_stops_between_batches(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    long_ago = datetime.utcnow() - timedelta(days=365)
+
+    issues = [
+        Issue(title=f"Old {index}", project_id=project_id, creator_id=owner["id"], deleted_at=long_ago)
+        for index in range(3)
+    ]
+    recent = Issue(title="Recent", project_id=project_id, creator_id=owner["id"], deleted_at=datetime.utcnow())
+    db.add_all(issues + [recent])
+    await db.flush()
+    issue_ids = [issue.id for issue in issues]
+    recent_id = recent.id
+    db.add_all([Comment(issue_id=issue_id, author_id=owner["id"], content="Comment") for issue_id in issue_ids])
+    await db.commit()
+
+    async def archived_issue_ids():
+        result = await db.execute(
+            select(ArchivedRow.row_id).where(ArchivedRow.table_name == "issues", ArchivedRow.row_id.in_(issue_ids + [recent_id]))
+        )
+        return set(result.scalars().all())
+
+    # Stopping returns after the batch in progress
+    stop = asyncio.Event()
+    stop.set()
+    archived = await purge_soft_deleted(older_than_days=30, batch_size=1, stop=stop)
+    assert archived == {"issues": 1, "comments": 0}
+    assert len(await archived_issue_ids()) == 1
+
+    archived = await purge_soft_deleted(older_than_days=30, batch_size=1)
+    assert archived["issues"] == 2
+    assert await archived_issue_ids() == set(issue_ids)
+
+    # Live tables only keep the recently deleted issue
+    result = await db.execute(select(func.count(Issue.id)).where(Issue.project_id == project_id))
+    assert result.scalar() == 1
+    result = await db.execute(
+        select(func.count(ArchivedRow.id)).where(ArchivedRow.table_name == "comments", ArchivedRow.data["issue_id"].as_integer().in_(issue_ids))
+    )
+    assert result.scalar() == 3
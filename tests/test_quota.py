@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, func
+
+from app.core.database import AsyncSessionLocal
+from app.models.issue import Issue, Subtask
+from app.utils.quota import (
+    LIMITS, PROJECT_ISSUES, ISSUE_SUBTASKS, try_reserve, release, current_count
+)
+from conftest import signup, create_project
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_issues(db, project_id: int, creator_id: int, count: int) -> list:
+    """Insert issues directly, bypassing the API (and the counter)"""
+    issues = [Issue(title=f"Issue {index}", project_id=project_id, creator_id=creator_id) for index in range(count)]
+    db.add_all(issues)
+    await db.flush()
+    issue_ids = [issue.id for issue in issues]
+    await db.commit()
+    return issue_ids
+
+
+async def create_issue(client, user: dict, project_id: int):
+    return await client.post("/api/issues", json={"title": "New issue", "project_id": project_id}, headers=user["headers"])
+
+
+async def test_reserve_refuses_at_limit(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    [issue_id] = await add_issues(db, project_id, owner["id"], 1)
+    limit = LIMITS[ISSUE_SUBTASKS]
+
+    for _ in range(limit):
+        assert await try_reserve(db, ISSUE_SUBTASKS, issue_id)
+    assert not await try_reserve(db, ISSUE_SUBTASKS, issue_id)
+    assert await current_count(db, ISSUE_SUBTASKS, issue_id) == limit
+
+    # All or nothing
+    await release(db, ISSUE_SUBTASKS, issue_id, 2)
+    assert not await try_reserve(db, ISSUE_SUBTASKS, issue_id, 3)
+    assert await try_reserve(db, ISSUE_SUBTASKS, issue_id, 2)
+    assert await current_count(db, ISSUE_SUBTASKS, issue_id) == limit
+
+
+async def test_counter_starts_from_existing_rows(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    await add_issues(db, project_id, owner["id"], 7)
+
+    assert await current_count(db, PROJECT_ISSUES, project_id) == 7
+
+
+async def test_create_at_limit_is_refused_and_delete_releases_one_slot(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    await add_issues(db, project_id, owner["id"], LIMITS[PROJECT_ISSUES] - 1)
+
+    response = await create_issue(client, owner, project_id)
+    assert response.status_code == 201, response.text
+    last_issue_id = response.json()["id"]
+
+    response = await create_issue(client, owner, project_id)
+    assert response.status_code == 400
+
+    response = await client.delete(f"/api/issues/{last_issue_id}", headers=owner["headers"])
+    assert response.status_code == 204, response.text
+
+    response = await create_issue(client, owner, project_id)
+    assert response.status_code == 201, response.text
+    response = await create_issue(client, owner, project_id)
+    assert response.status_code == 400
+
+
+async def test_concurrent_creates_stay_within_limit(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    [issue_id] = await add_issues(db, project_id, owner["id"], 1)
+    limit = LIMITS[ISSUE_SUBTASKS]
+
+    responses = await asyncio.gather(*[
+        client.post(f"/api/issues/{issue_id}/subtasks", json={"title": f"Subtask {index}"}, headers=owner["headers"])
+        for index in range(limit + 10)
+    ])
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] * limit + [400] * 10
+
+    result = await db.execute(select(func.count(Subtask.id)).where(Subtask.issue_id == issue_id))
+    assert result.scalar() == limit
+
+
+async def test_concurrent_reservations_in_separate_transactions(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    await add_issues(db, project_id, owner["id"], LIMITS[PROJECT_ISSUES] - 3)
+
+    async def reserve() -> bool:
+        async with AsyncSessionLocal() as session:
+            reserved = await try_reserve(session, PROJECT_ISSUES, project_id)
+            await session.commit()
+            return reserved
+
+    results = await asyncio.gather(*[reserve() for _ in range(10)])
+    assert results.count(True) == 3
+    assert await current_count(db, PROJECT_ISSUES, project_id) == LIMITS[PROJECT_ISSUES]
@@ -0,0 +1,173 @@
+import random
+
+import pytest
+from sqlalchemy import select
+
+from app.models.issue import Issue
+from app.utils.ranking import (
+    DIGITS, rank_between, spread_ranks, rank_next_to, rebalance_column, needs_rebalance
+)
+from conftest import signup, create_project
+
+
+def assert_valid(rank: str):
+    assert rank and set(rank) <= set(DIGITS)
+    assert not rank.endswith("0")
+
+
+@pytest.mark.parametrize("before, after", [
+    ("a", "b"),            # Adjacent digits
+    ("a", "c"),
+    (None, "a"),           # Before the first rank
+    (None, "1"),
+    (None, "01"),
+    ("z", None),           # After the last rank
+    ("zz", None),
+    (None, None),          # Empty column
+    ("a", "a5"),           # Different lengths, shared prefix
+    ("a5", "b"),
+    ("ab", "b"),
+    ("a", "a01"),
+    ("hzzz", "i"),
+])
+def test_rank_between(before, after):
+    rank = rank_between(before, after)
+    assert_valid(rank)
+    if before is not None:
+        assert before < rank
+    if after is not None:
+        assert rank < after
+
+
+@pytest.mark.parametrize("before, after", [("b", "a"), ("a", "a")])
+def test_rank_between_rejects_inverted_range(before, after):
+    with pytest.raises(ValueError):
+        rank_between(before, after)
+
+
+def test_random_moves_keep_order():
+    rng = random.Random(5)
+    ranks = [rank_between(None, None)]
+    for _ in range(2000):
+        index = rng.randint(0, len(ranks))
+        before = ranks[index - 1] if index > 0 else None
+        after = ranks[index] if index < len(ranks) else None
+        rank = rank_between(before, after)
+        assert_valid(rank)
+        ranks.insert(index, rank)
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+
+
+@pytest.mark.parametrize("count", [1, 2, 35, 36, 37, 500, 1296, 1297])
+def test_spread_ranks(count):
+    ranks = spread_ranks(count)
+    assert len(ranks) == count
+    assert ranks == sorted(ranks) and len(set(ranks)) == count
+    for rank in ranks:
+        assert_valid(rank)
+    # Room left between neighbours and at both edges
+    for before, after in zip([None] + ranks, ranks + [None]):
+        assert_valid(rank_between(before, after))
+
+
+def test_repeated_inserts_into_one_gap_ask_for_rebalance():
+    before, after = "a", "b"
+    for _ in range(200):
+        after = rank_between(before, after)
+        if needs_rebalance(after):
+            break
+    else:
+        pytest.fail("rank never grew past the rebalance length")
+    assert before < after
+
+
+@pytest.mark.anyio
+async def test_rank_next_to_and_rebalance(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    def issue(title, rank):
+        return Issue(title=title, project_id=project_id, creator_id=owner["id"], status="BACKLOG", rank=rank)
+
+    issues = [issue("first", "a"), issue("second", "b"), issue("moved", "c")]
+    db.add_all(issues)
+    await db.flush()
+    first, second, moved = [issue.id for issue in issues]
+    await db.commit()
+
+    # After the last card, between two cards, before the first card
+    rank = await rank_next_to(db, project_id, "BACKLOG", moved, moved, place_after=True)
+    assert rank > "c"
+    rank = await rank_next_to(db, project_id, "BACKLOG", first, moved, place_after=True)
+    assert "a" < rank < "b"
+    rank = await rank_next_to(db, project_id, "BACKLOG", first, moved, place_after=False)
+    assert rank < "a"
+    # The moved card itself is ignored as a neighbour
+    rank = await rank_next_to(db, project_id, "BACKLOG", second, moved, place_after=True)
+    assert rank > "b"
+    # Anchor in another column
+    assert await rank_next_to(db, project_id, "DONE", first, moved, place_after=True) is None
+
+    # Squeeze cards into the same gap until there is no short key left
+    before, after = "a", "b"
+    squeezed = []
+    while not needs_rebalance(after):
+        after = rank_between(before, after)
+        squeezed.append(issue(f"squeezed {len(squeezed)}", after))
+    db.add_all(squeezed)
+    unranked = issue("unranked", None)
+    db.add(unranked)
+    await db.flush()
+    unranked_id = unranked.id
+    await db.commit()
+
+    def column_order():
+        return (
+            select(Issue.id, Issue.rank)
+            .where(Issue.project_id == project_id, Issue.status == "BACKLOG")
+            .order_by(Issue.rank.is_(None), Issue.rank)
+        )
+
+    order_before = [row.id for row in (await db.execute(column_order())).all()]
+    await rebalance_column(db, project_id, "BACKLOG")
+    db.expire_all()
+    rows = (await db.execute(column_order())).all()
+
+    # Same order, unranked cards last, every rank short again
+    assert [row.id for row in rows] == order_before
+    assert rows[-1].id == unranked_id
+    assert all(row.rank is not None and not needs_rebalance(row.rank) for row in rows)
+    assert len({row.rank for row in rows}) == len(rows)
+
+
+@pytest.mark.anyio
+async def test_move_by_position_between_duplicate_ranks(client, db):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+
+    # Two concurrent appends stored the same rank
+    issues = [
+        Issue(title=title, project_id=project_id, creator_id=owner["id"], status="BACKLOG", rank=rank)
+        for title, rank in (("first", "m"), ("second", "m"), ("moved", "t"))
+    ]
+    db.add_all(issues)
+    await db.flush()
+    first, second, moved = [issue.id for issue in issues]
+    await db.commit()
+
+    response = await client.patch(
+        f"/api/issues/{moved}/status", json={"status": "BACKLOG", "position": 1}, headers=owner["headers"]
+    )
+    assert response.status_code == 200, response.text
+
+    # Appended for now; the background rebalance gave every card its own rank
+    result = await db.execute(
+        select(Issue.id, Issue.rank)
+        .where(Issue.project_id == project_id, Issue.status == "BACKLOG")
+        .order_by(Issue.rank)
+    )
+    rows = result.all()
+    assert [row.id for row in rows][-1] == moved
+    assert {row.id for row in rows[:2]} == {first, second}
+    assert len({row.rank for row in rows}) == len(rows)
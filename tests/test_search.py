@@ -0,0 +1,36 @@
+import pytest
+
+from app.utils.search import build_fts5_query
+from conftest import signup, create_project
+
+
+@pytest.mark.parametrize("raw_query, expected", [
+    ("crash", '"crash"*'),
+    ("crash on save", '"crash"* "on"* "save"*'),
+    ('crash" OR "x', '"crash"* "x"*'),
+    ("crash AND", '"crash"*'),
+    ("crash and save", '"crash"* "save"*'),
+    ("NOT crash", '"crash"*'),
+    ("crash Or NEAR save", '"crash"* "save"*'),
+    ("notes android", '"notes"* "android"*'),  # Only whole operator words
+    ("AND or", None),
+    ("***", None),
+])
+def test_build_fts5_query(raw_query, expected):
+    assert build_fts5_query(raw_query) == expected
+
+
+@pytest.mark.anyio
+async def test_operator_words_do_not_filter_results(client):
+    owner = await signup(client)
+    project_id = await create_project(client, owner)
+    response = await client.post(
+        "/api/issues", json={"title": "App crash on startup", "project_id": project_id}, headers=owner["headers"]
+    )
+    assert response.status_code == 201, response.text
+    issue_id = response.json()["id"]
+
+    for query in ("crash", "crash AND", "crash and startup", "NOT crash"):
+        response = await client.get("/api/issues/search", params={"q": query, "project_id": project_id}, headers=owner["headers"])
+        assert response.status_code == 200, response.text
+        assert [result["id"] for result in response.json()] == [issue_id], query